@@ -5,15 +5,23 @@ Find the right Field Development Engineers for your support tickets.
 """
 
 import streamlit as st
-import requests
-import json
-from datetime import datetime
+import orjson
 import os
+import re
 
 # Configuration
 API_ENDPOINT = os.getenv('API_ENDPOINT', 'https://api.example.com/find-fde')
 API_KEY = os.getenv('API_KEY', '')
 
+# (connect, read) timeouts: fail fast on an unreachable endpoint, but give
+# the Bedrock Agent up to two minutes to respond
+API_TIMEOUT = (5, 120)
+
+# Ticket ID patterns ("ticket 12345", "#12345", any 4+ digit number) fused
+# into one alternation so the input is scanned once
+_TICKET_ID_RE = re.compile(r'ticket\s+(\d+)|#(\d+)|\b(\d{4,})\b', re.IGNORECASE)
+_DIGITS = frozenset('0123456789')
+
 # Page configuration
 st.set_page_config(
     page_title="Zendesk FDE Finder",
@@ -23,7 +31,7 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -51,46 +59,192 @@ st.markdown("""
         border-left: 4px solid #ff9800;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-def call_api(ticket_id: str = None, ticket_description: str = None) -> dict:
-    """Call the FDE Finder API"""
-    try:
-        headers = {
-            'Content-Type': 'application/json',
-            'x-api-key': API_KEY
-        }
 
-        payload = {}
-        if ticket_id:
-            payload['ticket_id'] = ticket_id
-        if ticket_description:
-            payload['ticket_description'] = ticket_description
-
-        response = requests.post(
-            API_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=120
-        )
+@st.cache_data(show_spinner=False)
+def _get_css() -> str:
+    """Return the page CSS, cached across reruns"""
+    return _CSS
+
+
+st.markdown(_get_css(), unsafe_allow_html=True)
+
+# Result card templates, parsed once at import
+_FDE_CARD_TEMPLATE = (
+    '<div class="fde-card">\n'
+    '<h4>{i}. {name}</h4>\n'
+    '<p><strong>Match:</strong> {confidence:.0f}%</p>\n'
+    '<p><strong>Email:</strong> {email}</p>\n'
+    '<p><strong>Expertise:</strong> {expertise}</p>\n'
+    '<p><strong>Slack:</strong> @{slack_id}</p>\n'
+    '</div>\n'
+)
+
+_TICKET_CARD_TEMPLATE = (
+    '<div class="ticket-card">\n'
+    '<h5>Ticket #{ticket_id}: {subject}</h5>\n'
+    '<p><strong>Resolution:</strong> {resolution}...</p>\n'
+    '</div>\n'
+)
+
+# Static page header
+_HEADER_HTML = (
+    '<div class="main-header">Zendesk FDE Finder</div>\n'
+    '<div class="sub-header">Find the right Field Development Engineers for your support tickets</div>'
+)
+
+
+def extract_ticket_id(message: str) -> str:
+    """Extract a ticket ID from input like '#12345' or 'ticket 12345'"""
+    # Every pattern needs a digit; skip the regex engine for digit-free input
+    if not any(c in _DIGITS for c in message):
+        return None
+
+    match = _TICKET_ID_RE.search(message)
+    if not match:
+        return None
+    return next(group for group in match.groups() if group)
+
+
+@st.cache_resource
+def _get_session():
+    """Shared HTTP session so repeat API calls reuse the TLS connection"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'x-api-key': API_KEY
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount('https://', adapter)
+    return session
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_fdes(ticket_id: str = None, ticket_description: str = None) -> dict:
+    """POST to the FDE Finder API; successful responses are cached for 5 minutes"""
+    payload = {}
+    if ticket_id:
+        payload['ticket_id'] = ticket_id
+    if ticket_description:
+        payload['ticket_description'] = ticket_description
+
+    response = _get_session().post(
+        API_ENDPOINT,
+        data=orjson.dumps(payload),
+        timeout=API_TIMEOUT
+    )
+
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def call_api(ticket_id: str = None, ticket_description: str = None, refresh: bool = False) -> dict:
+    """Call the FDE Finder API; refresh drops any cached response for these inputs first"""
+    import requests
 
-        response.raise_for_status()
-        return response.json()
+    if refresh:
+        _fetch_fdes.clear(ticket_id, ticket_description)
+
+    try:
+        return _fetch_fdes(ticket_id, ticket_description)
 
     except requests.exceptions.Timeout:
         return {"error": "Request timed out. Please try again."}
     except requests.exceptions.RequestException as e:
         return {"error": f"API Error: {str(e)}"}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return {"error": "Invalid response from API"}
 
 
+def _trunc(text: str, limit: int = 200) -> str:
+    """Return text cut to limit characters, without copying short strings"""
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit]
+
+
+def format_fde_cards(recommended_fdes: list) -> str:
+    """Build the HTML for all FDE cards in one string"""
+    parts = []
+    for i, fde in enumerate(recommended_fdes, 1):
+        parts.append(_FDE_CARD_TEMPLATE.format(
+            i=i,
+            name=fde.get('name', 'Unknown'),
+            confidence=fde.get('confidence', 0) * 100,
+            email=fde.get('email', 'N/A'),
+            expertise=', '.join(fde.get('expertise', [])),
+            slack_id=fde.get('slack_id', 'N/A')
+        ))
+    return "".join(parts)
+
+
+def format_ticket_cards(similar_tickets: list) -> str:
+    """Build the HTML for all similar-ticket cards in one string"""
+    parts = []
+    for ticket in similar_tickets:
+        parts.append(_TICKET_CARD_TEMPLATE.format(
+            ticket_id=ticket.get('ticket_id', 'N/A'),
+            subject=ticket.get('subject', 'No subject'),
+            resolution=_trunc(ticket.get('resolution', 'No resolution details'))
+        ))
+    return "".join(parts)
+
+
+@st.fragment
+def _render_result():
+    """Render the last API result; reruns independently of the input form"""
+    if st.session_state.show_result and st.session_state.result:
+        result = st.session_state.result
+
+        if "error" in result:
+            st.error(result["error"])
+        else:
+            st.success("Successfully found FDEs for your issue!")
+
+            # Two column layout for results
+            col_left, col_right = st.columns([1, 1])
+
+            with col_left:
+                st.markdown("### Recommended Field Development Engineers")
+
+                if st.session_state.fde_cards_html:
+                    st.html(st.session_state.fde_cards_html)
+                else:
+                    st.info("No FDEs found for this ticket")
+
+            with col_right:
+                st.markdown("### Similar Resolved Tickets")
+
+                if st.session_state.ticket_cards_html:
+                    st.html(st.session_state.ticket_cards_html)
+                else:
+                    st.info("No similar tickets found")
+
+            # Action links if available
+            if result.get('slack_conversation_url') or result.get('zendesk_url'):
+                st.markdown("---")
+                st.markdown("### Next Steps")
+
+                link_col1, link_col2 = st.columns(2)
+
+                with link_col1:
+                    if result.get('slack_conversation_url'):
+                        st.markdown(f"[Open Slack Conversation]({result['slack_conversation_url']})")
+
+                with link_col2:
+                    if result.get('zendesk_url'):
+                        st.markdown(f"[View Zendesk Ticket]({result['zendesk_url']})")
+
+
 def main():
     """Main application"""
 
     # Header
-    st.markdown('<div class="main-header">Zendesk FDE Finder</div>', unsafe_allow_html=True)
-    st.markdown('<div class="sub-header">Find the right Field Development Engineers for your support tickets</div>', unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     st.markdown("---")
 
@@ -112,6 +266,10 @@ def main():
         st.session_state.result = None
     if 'show_result' not in st.session_state:
         st.session_state.show_result = False
+    if 'fde_cards_html' not in st.session_state:
+        st.session_state.fde_cards_html = ""
+    if 'ticket_cards_html' not in st.session_state:
+        st.session_state.ticket_cards_html = ""
 
     # Input fields based on selection
     ticket_id = None
@@ -134,12 +292,19 @@ def main():
         )
 
     # Buttons
-    col1, col2 = st.columns([1, 1])
+    col1, col2, col3 = st.columns([1, 1, 1])
 
     with col1:
         find_button = st.button("Find FDEs", type="primary", use_container_width=True)
 
     with col2:
+        refresh_button = st.button(
+            "Refresh",
+            use_container_width=True,
+            help="Results are cached for 5 minutes; re-run the search for this ticket"
+        )
+
+    with col3:
         clear_button = st.button("Clear", use_container_width=True)
 
     # Handle clear button
@@ -149,80 +314,39 @@ def main():
         st.rerun()
 
     # Handle find button
-    if find_button:
+    if find_button or refresh_button:
         if input_method == "Ticket ID" and not ticket_id:
             st.warning("Please enter a ticket ID")
             return
 
+        if ticket_id:
+            ticket_id = extract_ticket_id(ticket_id) or ticket_id.strip()
+
         if input_method == "Ticket Description" and not ticket_description:
             st.warning("Please enter a ticket description")
             return
 
         # Show loading spinner
         with st.spinner("Finding FDEs... This may take up to 2 minutes."):
-            result = call_api(ticket_id=ticket_id, ticket_description=ticket_description)
+            result = call_api(
+                ticket_id=ticket_id,
+                ticket_description=ticket_description,
+                refresh=refresh_button
+            )
             st.session_state.result = result
+
+            # Format the cards once here instead of on every rerun
+            if "error" not in result:
+                st.session_state.fde_cards_html = format_fde_cards(
+                    result.get('recommended_fdes') or []
+                )
+                st.session_state.ticket_cards_html = format_ticket_cards(
+                    (result.get('similar_tickets') or [])[:5]
+                )
             st.session_state.show_result = True
 
     # Display results
-    if st.session_state.show_result and st.session_state.result:
-        result = st.session_state.result
-
-        if "error" in result:
-            st.error(result["error"])
-        else:
-            st.success("Successfully found FDEs for your issue!")
-
-            # Two column layout for results
-            col_left, col_right = st.columns([1, 1])
-
-            with col_left:
-                st.markdown("### Recommended Field Development Engineers")
-
-                if result.get('recommended_fdes'):
-                    for i, fde in enumerate(result['recommended_fdes'], 1):
-                        confidence = fde.get('confidence', 0) * 100
-
-                        st.markdown(f"""
-                        <div class="fde-card">
-                            <h4>{i}. {fde.get('name', 'Unknown')}</h4>
-                            <p><strong>Match:</strong> {confidence:.0f}%</p>
-                            <p><strong>Email:</strong> {fde.get('email', 'N/A')}</p>
-                            <p><strong>Expertise:</strong> {', '.join(fde.get('expertise', []))}</p>
-                            <p><strong>Slack:</strong> @{fde.get('slack_id', 'N/A')}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.info("No FDEs found for this ticket")
-
-            with col_right:
-                st.markdown("### Similar Resolved Tickets")
-
-                if result.get('similar_tickets'):
-                    for ticket in result['similar_tickets'][:5]:
-                        st.markdown(f"""
-                        <div class="ticket-card">
-                            <h5>Ticket #{ticket.get('ticket_id', 'N/A')}: {ticket.get('subject', 'No subject')}</h5>
-                            <p><strong>Resolution:</strong> {ticket.get('resolution', 'No resolution details')[:200]}...</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.info("No similar tickets found")
-
-            # Action links if available
-            if result.get('slack_conversation_url') or result.get('zendesk_url'):
-                st.markdown("---")
-                st.markdown("### Next Steps")
-
-                link_col1, link_col2 = st.columns(2)
-
-                with link_col1:
-                    if result.get('slack_conversation_url'):
-                        st.markdown(f"[Open Slack Conversation]({result['slack_conversation_url']})")
-
-                with link_col2:
-                    if result.get('zendesk_url'):
-                        st.markdown(f"[View Zendesk Ticket]({result['zendesk_url']})")
+    _render_result()
 
 
 if __name__ == "__main__":
@@ -8,18 +8,57 @@ It handles the API path:
 
 import json
 import os
-import boto3
-from typing import Dict, Any, List
-import logging
+import re
+from typing import Dict, Any, List, Optional
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+# Import shared utilities (Lambda Layer)
+import sys
+sys.path.insert(0, '/opt/python')  # Lambda Layer path
+
+# Secrets are cached across warm invocations (SECRET_CACHE_TTL)
+from aws_clients import get_secret
+from logging_config import StructuredLogger, log_lambda_event
 
 # Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger = StructuredLogger(__name__)
+
+# Slack client reused across warm invocations (rebuilt if the token rotates)
+_slack_client: Optional[WebClient] = None
+
+# Workspace URL used for archive links; set at deploy time or resolved once
+# per container
+_WORKSPACE_URL: Optional[str] = os.environ.get('SLACK_WORKSPACE_URL') or None
+if _WORKSPACE_URL:
+    _WORKSPACE_URL = _WORKSPACE_URL.rstrip('/') + '/'
+
+# Characters Slack rejects in channel names (allowed: a-z, 0-9, '-', '_')
+_CHANNEL_INVALID = re.compile(r'[^a-z0-9_-]')
+
+# Slack rate limits apply per app and workspace, not per container; on a
+# `ratelimited` (HTTP 429) response retry once after the Retry-After delay
+SLACK_RATE_LIMIT_RETRIES = 1
+
+# Initial channel message; only the str.format substitution runs per request
+_INITIAL_MSG_TEMPLATE = """
+:ticket: *New Support Ticket Needs FDE Assistance*
 
-# Slack configuration
-secrets_client = boto3.client('secretsmanager')
+*Ticket:* <{zendesk_url}|#{ticket_id}>
+*Subject:* {ticket_subject}
+
+Hello <@{engineer}>! The AI system has identified the following FDEs as best matches for this ticket:
+
+{fde_mentions}
+
+*Next Steps:*
+1. Review the ticket details in Zendesk
+2. FDEs: Please review and indicate if you can assist
+3. Collaborate here to resolve the issue
+
+The ticket has been updated with this Slack conversation link.
+"""
 
 
 def get_slack_credentials() -> Dict[str, str]:
@@ -27,14 +66,40 @@ def get_slack_credentials() -> Dict[str, str]:
     secret_name = os.environ.get('SLACK_SECRET_NAME', 'slack/bot-credentials')
 
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(response['SecretString'])
-        return secret
+        return get_secret(secret_name)
     except Exception as e:
         logger.error(f"Error fetching Slack credentials: {str(e)}")
         raise
 
 
+def get_slack_client() -> WebClient:
+    """Return the module-level Slack client, creating it on first use"""
+    global _slack_client
+
+    bot_token = get_slack_credentials()['bot_token']
+    if _slack_client is None or _slack_client.token != bot_token:
+        _slack_client = WebClient(token=bot_token)
+        _slack_client.retry_handlers.append(
+            RateLimitErrorRetryHandler(max_retry_count=SLACK_RATE_LIMIT_RETRIES)
+        )
+    return _slack_client
+
+
+def channel_name_for_ticket(ticket_id: str) -> str:
+    """Deterministic channel name for a ticket (lowercase, invalid chars -> '-', max 80 chars)"""
+    return _CHANNEL_INVALID.sub('-', f"ticket-{ticket_id}".lower())[:80]
+
+
+def get_workspace_url(client: WebClient) -> str:
+    """Return the workspace URL, falling back to the secret's team_url or auth_test"""
+    global _WORKSPACE_URL
+
+    if _WORKSPACE_URL is None:
+        team_url = get_slack_credentials().get('team_url') or client.auth_test()['url']
+        _WORKSPACE_URL = team_url.rstrip('/') + '/'
+    return _WORKSPACE_URL
+
+
 def create_conversation(
     ticket_id: str,
     engineer_slack_id: str,
@@ -54,15 +119,11 @@ def create_conversation(
     logger.info(f"Creating Slack conversation for ticket {ticket_id}")
 
     try:
-        # Get Slack credentials
-        creds = get_slack_credentials()
-        bot_token = creds['bot_token']
-
-        # Initialize Slack client
-        client = WebClient(token=bot_token)
+        # Get (cached) Slack client
+        client = get_slack_client()
 
         # Create channel name (Slack channel names must be lowercase, no spaces)
-        channel_name = f"ticket-{ticket_id}".lower().replace(' ', '-')[:80]
+        channel_name = channel_name_for_ticket(ticket_id)
 
         # Create private channel
         logger.info(f"Creating channel: {channel_name}")
@@ -74,48 +135,47 @@ def create_conversation(
         channel_id = create_response['channel']['id']
         logger.info(f"Channel created: {channel_id}")
 
-        # Invite engineer
-        if engineer_slack_id:
-            try:
-                client.conversations_invite(
-                    channel=channel_id,
-                    users=engineer_slack_id
-                )
-                logger.info(f"Invited engineer: {engineer_slack_id}")
-            except SlackApiError as e:
-                logger.warning(f"Could not invite engineer {engineer_slack_id}: {e.response['error']}")
-
-        # Invite FDEs
-        for fde_id in fde_slack_ids:
+        # Invite engineer and FDEs in a single call (users accepts a
+        # comma-separated list); force=True keeps inviting the valid IDs
+        # when some of them fail
+        invitees = list(dict.fromkeys(
+            user_id for user_id in [engineer_slack_id] + fde_slack_ids if user_id
+        ))
+        failed = set()
+        if invitees:
+            # With force=True an ok response can still list per-user
+            # failures in `errors`; those users are not in the channel
             try:
-                client.conversations_invite(
+                invite_response = client.conversations_invite(
                     channel=channel_id,
-                    users=fde_id
+                    users=",".join(invitees),
+                    force=True
                 )
-                logger.info(f"Invited FDE: {fde_id}")
+                user_errors = invite_response.get('errors') or []
             except SlackApiError as e:
-                logger.warning(f"Could not invite FDE {fde_id}: {e.response['error']}")
+                user_errors = e.response.get('errors') or []
+                if not user_errors:
+                    logger.warning(f"Could not invite users {invitees}: {e.response['error']}")
+                    failed.update(invitees)
 
-        # Post initial message
-        fde_mentions = ' '.join([f"<@{fde_id}>" for fde_id in fde_slack_ids])
+            for user_error in user_errors:
+                logger.warning(f"Could not invite {user_error.get('user')}: {user_error.get('error')}")
+                failed.add(user_error.get('user'))
 
-        message = f"""
-:ticket: *New Support Ticket Needs FDE Assistance*
-
-*Ticket:* <{zendesk_url}|#{ticket_id}>
-*Subject:* {ticket_subject}
+        invited = [user_id for user_id in invitees if user_id not in failed]
+        if invited:
+            logger.info(f"Invited users: {', '.join(invited)}")
 
-Hello <@{engineer_slack_id}>! The AI system has identified the following FDEs as best matches for this ticket:
-
-{fde_mentions}
-
-*Next Steps:*
-1. Review the ticket details in Zendesk
-2. FDEs: Please review and indicate if you can assist
-3. Collaborate here to resolve the issue
+        # Post initial message
+        fde_mentions = ' '.join(f"<@{fde_id}>" for fde_id in fde_slack_ids)
 
-The ticket has been updated with this Slack conversation link.
-"""
+        message = _INITIAL_MSG_TEMPLATE.format(
+            zendesk_url=zendesk_url,
+            ticket_id=ticket_id,
+            ticket_subject=ticket_subject,
+            engineer=engineer_slack_id,
+            fde_mentions=fde_mentions
+        )
 
         client.chat_postMessage(
             channel=channel_id,
@@ -127,15 +187,14 @@ The ticket has been updated with this Slack conversation link.
 
         # Get channel permalink
         # Slack workspace URL format: https://{workspace}.slack.com/archives/{channel_id}
-        workspace_info = client.auth_test()
-        team_url = workspace_info['url']
+        team_url = get_workspace_url(client)
         conversation_url = f"{team_url}archives/{channel_id}"
 
         result = {
             'conversation_url': conversation_url,
             'channel_id': channel_id,
             'channel_name': channel_name,
-            'members_invited': [engineer_slack_id] + fde_slack_ids
+            'members_invited': invited
         }
 
         logger.info(f"Successfully created conversation: {conversation_url}")
@@ -171,7 +230,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         ]
     }
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    log_lambda_event(logger, event, context)
 
     try:
         # Extract parameters
@@ -9,33 +9,56 @@ It handles two API paths:
 
 import json
 import os
-import boto3
 from typing import Dict, Any
-import logging
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# Import shared utilities (Lambda Layer)
+import sys
+sys.path.insert(0, '/opt/python')  # Lambda Layer path
 
-# Zendesk configuration
-secrets_client = boto3.client('secretsmanager')
+# Secrets are cached across warm invocations (SECRET_CACHE_TTL)
+from aws_clients import get_secret
+from logging_config import StructuredLogger, log_lambda_event
 
+# Configure logging
+logger = StructuredLogger(__name__)
+
+# HTTP session reused across warm invocations (keep-alive to *.zendesk.com).
+# Only GETs are retried; retrying a PUT could post the comment twice.
+_session = requests.Session()
+_session.headers.update({'Content-Type': 'application/json'})
+_session.mount('https://', HTTPAdapter(
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset({'GET'})
+    )
+))
 
 def get_zendesk_credentials() -> Dict[str, str]:
     """Fetch Zendesk credentials from Secrets Manager"""
     secret_name = os.environ.get('ZENDESK_SECRET_NAME', 'zendesk/api-credentials')
 
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(response['SecretString'])
-        return secret
+        return get_secret(secret_name)
     except Exception as e:
         logger.error(f"Error fetching Zendesk credentials: {str(e)}")
         raise
 
 
+def get_zendesk_session(email: str, api_token: str) -> requests.Session:
+    """Return the shared Zendesk session with API-token auth attached"""
+    auth = HTTPBasicAuth(f"{email}/token", api_token)
+    if _session.auth != auth:
+        _session.auth = auth
+    return _session
+
+
 def fetch_ticket(ticket_id: str) -> Dict[str, Any]:
     """
     Fetch ticket details from Zendesk API.
@@ -54,28 +77,31 @@ def fetch_ticket(ticket_id: str) -> Dict[str, Any]:
         domain = creds['domain']
         email = creds['email']
         api_token = creds['api_token']
+        session = get_zendesk_session(email, api_token)
 
-        # Fetch ticket
-        url = f"https://{domain}/api/v2/tickets/{ticket_id}.json"
-        response = requests.get(
-            url,
-            auth=HTTPBasicAuth(f"{email}/token", api_token),
-            headers={'Content-Type': 'application/json'}
-        )
+        # Fetch ticket, sideloading its users so the assignee arrives in the
+        # same response instead of needing a second request
+        url = f"https://{domain}/api/v2/tickets/{ticket_id}.json?include=users"
+        response = session.get(url)
         response.raise_for_status()
 
-        ticket_data = response.json()['ticket']
+        response_data = response.json()
+        ticket_data = response_data['ticket']
+        users = {user['id']: user for user in response_data.get('users', [])}
 
-        # Fetch assignee details if assigned
+        # Resolve assignee details if assigned
         assigned_engineer = None
-        if ticket_data.get('assignee_id'):
-            user_url = f"https://{domain}/api/v2/users/{ticket_data['assignee_id']}.json"
-            user_response = requests.get(
-                user_url,
-                auth=HTTPBasicAuth(f"{email}/token", api_token)
-            )
-            if user_response.status_code == 200:
-                user_data = user_response.json()['user']
+        assignee_id = ticket_data.get('assignee_id')
+        if assignee_id:
+            user_data = users.get(assignee_id)
+            if user_data is None:
+                # Sideload missed the user; fall back to a direct lookup
+                user_url = f"https://{domain}/api/v2/users/{assignee_id}.json"
+                user_response = session.get(user_url)
+                if user_response.status_code == 200:
+                    user_data = user_response.json()['user']
+
+            if user_data:
                 assigned_engineer = {
                     'id': user_data['id'],
                     'name': user_data['name'],
@@ -124,6 +150,7 @@ def update_ticket(ticket_id: str, slack_url: str, recommended_fdes: list) -> Dic
         domain = creds['domain']
         email = creds['email']
         api_token = creds['api_token']
+        session = get_zendesk_session(email, api_token)
 
         # Format FDE list
         fde_list = "\n".join([
@@ -153,12 +180,7 @@ The assigned engineer and recommended FDEs have been added to a Slack conversati
             }
         }
 
-        response = requests.put(
-            url,
-            auth=HTTPBasicAuth(f"{email}/token", api_token),
-            headers={'Content-Type': 'application/json'},
-            json=payload
-        )
+        response = session.put(url, json=payload)
         response.raise_for_status()
 
         logger.info(f"Successfully updated ticket {ticket_id}")
@@ -196,7 +218,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         ]
     }
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    log_lambda_event(logger, event, context)
 
     try:
         # Extract action details
@@ -2,34 +2,81 @@
 Embedding Generator Lambda Handler
 
 This Lambda function:
-1. Triggered by S3 event when new ticket is uploaded
+1. Triggered by S3 event when new tickets are uploaded (all records in the batch)
 2. Reads ticket data from S3
-3. Generates embeddings using AWS Bedrock Titan
+3. Generates embeddings using AWS Bedrock Titan (concurrently per record)
 4. Stores vectors in Pinecone with metadata
 5. Triggers Step Functions workflow for SME matching
 """
 
-import json
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import boto3
+import orjson
 from botocore.exceptions import ClientError
 
-# Import shared utilities
+# Import shared utilities (Lambda Layer)
 import sys
-sys.path.append('/opt/python')  # Lambda layer path
-from shared.python.logging_config import get_logger
-from shared.python.aws_clients import get_bedrock_runtime_client, get_s3_client, get_sfn_client
-from shared.python.metrics import publish_metric
-from shared.python.constants import (
+sys.path.insert(0, '/opt/python')  # Lambda Layer path
+
+from logging_config import StructuredLogger
+from aws_clients import (
+    get_bedrock_runtime_client,
+    get_s3_client,
+    get_sfn_client,
+    flush_metrics,
+    put_cloudwatch_metric
+)
+from constants import (
     S3_BUCKET_TICKETS,
     BEDROCK_EMBEDDING_MODEL_ID,
     PINECONE_INDEX_NAME,
-    STEP_FUNCTION_ARN
+    PINECONE_DIMENSION,
+    STEP_FUNCTION_ARN,
+    TITAN_EMBEDDING_DIMENSION,
+    TITAN_NORMALIZE
 )
 
-logger = get_logger(__name__)
+logger = StructuredLogger(__name__)
+
+# Every vector is upserted into the index as-is, so a mismatch would fail
+# each upsert; fail the cold start instead
+if TITAN_EMBEDDING_DIMENSION != PINECONE_DIMENSION:
+    raise ValueError(
+        f"TITAN_EMBEDDING_DIMENSION ({TITAN_EMBEDDING_DIMENSION}) must match "
+        f"PINECONE_DIMENSION ({PINECONE_DIMENSION})"
+    )
+
+# Upper bound on concurrent S3 read + Bedrock invoke calls per batch
+MAX_EMBEDDING_WORKERS = 8
+
+# Character budgets for embedding text (~4 chars/token keeps the total well
+# under Titan's 8K-token input limit)
+MAX_DESCRIPTION_CHARS = 4000
+MAX_COMMENT_CHARS = 500
+MAX_EMBEDDING_TEXT_CHARS = 24000
+
+# Pinecone accepts at most 100 vectors per upsert request
+PINECONE_UPSERT_BATCH_SIZE = 100
+PINECONE_POOL_THREADS = 4
+
+# Pinecone index handle, created on first use and reused across warm invocations
+_pinecone_index: Optional[Any] = None
+
+
+def _get_index() -> Any:
+    """Return the module-level Pinecone index, initializing the client once"""
+    global _pinecone_index
+
+    if _pinecone_index is None:
+        from pinecone import Pinecone
+
+        pc = Pinecone(api_key=os.environ['PINECONE_API_KEY'])
+        _pinecone_index = pc.Index(PINECONE_INDEX_NAME, pool_threads=PINECONE_POOL_THREADS)
+    return _pinecone_index
 
 
 class EmbeddingGenerator:
@@ -45,7 +92,7 @@ class EmbeddingGenerator:
         """Read ticket data from S3"""
         try:
             response = self.s3.get_object(Bucket=bucket, Key=key)
-            ticket_data = json.loads(response['Body'].read().decode('utf-8'))
+            ticket_data = orjson.loads(response['Body'].read())
 
             logger.info("Successfully read ticket from S3", extra={
                 "bucket": bucket,
@@ -76,29 +123,29 @@ class EmbeddingGenerator:
         customer = ticket_data.get('customer_name', 'Unknown')
         priority = ticket.get('priority', 'normal')
         subject = ticket.get('subject', '')
-        description = ticket.get('description', '')
+        description = (ticket.get('description') or '')[:MAX_DESCRIPTION_CHARS]
         tags = ', '.join(ticket.get('tags', []))
 
-        # Get last 5 comments for context
-        recent_comments = []
-        for comment in comments[-5:]:
-            author = comment.get('author_name', 'Unknown')
-            body = comment.get('body', '')
-            recent_comments.append(f"{author}: {body}")
-
-        conversation_history = '\n'.join(recent_comments)
-
-        # Construct comprehensive embedding text
-        embedding_text = f"""
-Ticket ID: {ticket_id}
-Customer: {customer}
-Priority: {priority}
-Subject: {subject}
-Description: {description}
-Tags: {tags}
-Recent Conversation:
-{conversation_history}
-        """.strip()
+        # Construct comprehensive embedding text, writing comment bodies
+        # straight into the buffer instead of joining an intermediate list
+        buf = io.StringIO()
+        buf.write(
+            f"Ticket ID: {ticket_id}\n"
+            f"Customer: {customer}\n"
+            f"Priority: {priority}\n"
+            f"Subject: {subject}\n"
+            f"Description: {description}\n"
+            f"Tags: {tags}\n"
+            "Recent Conversation:\n"
+        )
+
+        # Last 5 comments for context
+        for i, comment in enumerate(comments[-5:]):
+            if i:
+                buf.write('\n')
+            buf.write(f"{comment.get('author_name', 'Unknown')}: {(comment.get('body') or '')[:MAX_COMMENT_CHARS]}")
+
+        embedding_text = buf.getvalue().rstrip()[:MAX_EMBEDDING_TEXT_CHARS]
 
         logger.info("Prepared embedding text", extra={
             "ticket_id": ticket_id,
@@ -111,12 +158,17 @@ Recent Conversation:
     def generate_embedding(self, text: str) -> List[float]:
         """
         Generate embedding using Bedrock Titan Embeddings.
-        Returns a 1024-dimensional vector.
+        Returns a TITAN_EMBEDDING_DIMENSION-dimensional vector (1024 by
+        default; Titan V2 also supports 512 and 256), normalized unless
+        TITAN_NORMALIZE is false.
         """
         try:
-            # Prepare request for Bedrock
+            # Prepare request for Bedrock; request the dimension explicitly
+            # so smaller vectors are a configuration change
             request_body = {
-                "inputText": text
+                "inputText": text,
+                "dimensions": TITAN_EMBEDDING_DIMENSION,
+                "normalize": TITAN_NORMALIZE
             }
 
             # Invoke Bedrock model
@@ -124,16 +176,16 @@ Recent Conversation:
                 modelId=self.model_id,
                 contentType='application/json',
                 accept='application/json',
-                body=json.dumps(request_body)
+                body=orjson.dumps(request_body)
             )
 
             # Parse response
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             embedding = response_body.get('embedding', [])
 
             # Track metrics
             input_tokens = response_body.get('inputTextTokenCount', 0)
-            publish_metric(
+            put_cloudwatch_metric(
                 namespace='EmbeddingGenerator',
                 metric_name='BedrockTokensUsed',
                 value=input_tokens,
@@ -153,7 +205,7 @@ Recent Conversation:
 
             if error_code == 'ThrottlingException':
                 logger.warning("Bedrock throttling encountered, will retry")
-                publish_metric(
+                put_cloudwatch_metric(
                     namespace='EmbeddingGenerator',
                     metric_name='BedrockThrottling',
                     value=1,
@@ -166,74 +218,105 @@ Recent Conversation:
             })
             raise
 
-    def store_in_pinecone(self, ticket_data: Dict[str, Any], embedding: List[float]) -> None:
-        """
-        Store embedding in Pinecone with metadata.
-        Note: Pinecone client initialization happens here.
-        """
-        try:
-            from pinecone import Pinecone
+    def build_vector(self, ticket_data: Dict[str, Any], embedding: List[float], now_iso: str) -> Dict[str, Any]:
+        """Build the Pinecone vector record (id, values, metadata) for a ticket"""
+        ticket = ticket_data.get('ticket', {})
+        ticket_id = str(ticket.get('id', 'unknown'))
 
-            # Initialize Pinecone
-            pc = Pinecone(api_key=os.environ['PINECONE_API_KEY'])
-            index = pc.Index(PINECONE_INDEX_NAME)
+        # Prepare metadata
+        metadata = {
+            "ticket_id": ticket_id,
+            "customer_id": ticket_data.get('customer_id', 'unknown'),
+            "customer_name": ticket_data.get('customer_name', 'Unknown'),
+            "priority": ticket.get('priority', 'normal'),
+            "created_at": ticket.get('created_at', now_iso),
+            "tags": ticket.get('tags', []),
+            "subject": ticket.get('subject', '')[:200],  # Truncate for metadata
+            "cre_id": ticket_data.get('cre_id', 'unknown'),
+            "resolution_success": False,  # Will be updated via feedback
+            "timestamp": now_iso
+        }
 
-            ticket = ticket_data.get('ticket', {})
-            ticket_id = str(ticket.get('id', 'unknown'))
+        return {
+            "id": f"ticket-{ticket_id}",
+            "values": embedding,
+            "metadata": metadata
+        }
 
-            # Prepare metadata
-            metadata = {
-                "ticket_id": ticket_id,
-                "customer_id": ticket_data.get('customer_id', 'unknown'),
-                "customer_name": ticket_data.get('customer_name', 'Unknown'),
-                "priority": ticket.get('priority', 'normal'),
-                "created_at": ticket.get('created_at', datetime.utcnow().isoformat()),
-                "tags": ticket.get('tags', []),
-                "subject": ticket.get('subject', '')[:200],  # Truncate for metadata
-                "cre_id": ticket_data.get('cre_id', 'unknown'),
-                "resolution_success": False,  # Will be updated via feedback
-                "timestamp": datetime.utcnow().isoformat()
-            }
+    def store_in_pinecone(
+        self,
+        items: List[Tuple[Dict[str, Any], List[float]]],
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Store embeddings in Pinecone with metadata.
 
-            # Upsert to Pinecone
-            index.upsert(
-                vectors=[{
-                    "id": f"ticket-{ticket_id}",
-                    "values": embedding,
-                    "metadata": metadata
-                }],
-                namespace="tickets"
-            )
+        Vectors are upserted in batches of up to PINECONE_UPSERT_BATCH_SIZE;
+        multiple batches are sent in parallel. `now` is the invocation
+        timestamp shared by every vector's metadata.
+        """
+        now_iso = (now or datetime.utcnow()).isoformat()
+        ticket_ids = [str(ticket_data.get('ticket', {}).get('id', 'unknown')) for ticket_data, _ in items]
 
-            logger.info("Successfully stored embedding in Pinecone", extra={
-                "ticket_id": ticket_id,
+        try:
+            index = _get_index()
+
+            vectors = [self.build_vector(ticket_data, embedding, now_iso) for ticket_data, embedding in items]
+
+            # Upsert to Pinecone, one request per batch
+            async_results = [
+                index.upsert(
+                    vectors=vectors[i:i + PINECONE_UPSERT_BATCH_SIZE],
+                    namespace="tickets",
+                    async_req=True
+                )
+                for i in range(0, len(vectors), PINECONE_UPSERT_BATCH_SIZE)
+            ]
+            for async_result in async_results:
+                async_result.get()
+
+            logger.info("Successfully stored embeddings in Pinecone", extra={
+                "ticket_ids": ticket_ids,
+                "num_batches": len(async_results),
                 "index_name": PINECONE_INDEX_NAME,
                 "namespace": "tickets"
             })
 
-            publish_metric(
+            put_cloudwatch_metric(
                 namespace='EmbeddingGenerator',
                 metric_name='PineconeUpsertSuccess',
-                value=1,
+                value=len(vectors),
                 unit='Count'
             )
 
         except Exception as e:
             logger.error("Failed to store in Pinecone", extra={
                 "error": str(e),
-                "ticket_id": ticket_data.get('ticket', {}).get('id')
+                "ticket_ids": ticket_ids
             })
 
-            publish_metric(
+            put_cloudwatch_metric(
                 namespace='EmbeddingGenerator',
                 metric_name='PineconeUpsertFailure',
-                value=1,
+                value=len(items),
                 unit='Count'
             )
             raise
 
-    def trigger_step_function(self, ticket_data: Dict[str, Any]) -> str:
-        """Trigger Step Functions workflow for SME matching"""
+    def trigger_step_function(
+        self,
+        ticket_data: Dict[str, Any],
+        now: Optional[datetime] = None,
+        index: int = 0
+    ) -> str:
+        """
+        Trigger Step Functions workflow for SME matching.
+
+        `index` is the record's position in the batch; it keeps execution
+        names unique when a batch shares one `now` and repeats a ticket ID.
+        """
+        now = now or datetime.utcnow()
+
         try:
             ticket_id = ticket_data.get('ticket', {}).get('id', 'unknown')
 
@@ -243,14 +326,14 @@ Recent Conversation:
                 "bucket": S3_BUCKET_TICKETS,
                 "key": ticket_data.get('s3_key', ''),
                 "embedding_exists": True,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             }
 
             # Start execution
             response = self.sfn.start_execution(
                 stateMachineArn=STEP_FUNCTION_ARN,
-                name=f"sme-match-{ticket_id}-{int(datetime.utcnow().timestamp())}",
-                input=json.dumps(sfn_input)
+                name=f"sme-match-{ticket_id}-{int(now.timestamp())}-{index}",
+                input=orjson.dumps(sfn_input).decode()
             )
 
             execution_arn = response['executionArn']
@@ -260,7 +343,7 @@ Recent Conversation:
                 "execution_arn": execution_arn
             })
 
-            publish_metric(
+            put_cloudwatch_metric(
                 namespace='EmbeddingGenerator',
                 metric_name='StepFunctionTriggered',
                 value=1,
@@ -277,10 +360,44 @@ Recent Conversation:
             raise
 
 
+# Generator (and its boto3 clients) reused across warm invocations
+_generator: Optional[EmbeddingGenerator] = None
+
+
+def _get_generator() -> EmbeddingGenerator:
+    """Return the module-level EmbeddingGenerator, creating it on first use"""
+    global _generator
+
+    if _generator is None:
+        _generator = EmbeddingGenerator()
+    return _generator
+
+
+def embed_record(generator: EmbeddingGenerator, record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[float]]:
+    """Read, prepare and embed the ticket referenced by a single S3 event record"""
+    bucket = record['s3']['bucket']['name']
+    key = record['s3']['object']['key']
+
+    # Step 1: Read ticket from S3
+    ticket_data = generator.read_ticket_from_s3(bucket, key)
+    ticket_data['s3_key'] = key  # Store for later use
+
+    # Step 2: Prepare embedding text
+    embedding_text = generator.prepare_embedding_text(ticket_data)
+
+    # Step 3: Generate embedding
+    embedding = generator.generate_embedding(embedding_text)
+
+    return ticket_data, embedding
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Lambda handler for S3 event trigger.
 
+    Every record in the event is processed; S3 reads and Bedrock calls run
+    concurrently across records.
+
     Event structure:
     {
         "Records": [{
@@ -295,46 +412,48 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     try:
         # Parse S3 event
-        record = event['Records'][0]
-        bucket = record['s3']['bucket']['name']
-        key = record['s3']['object']['key']
+        records = event['Records']
 
         logger.info("Embedding generation started", extra={
-            "bucket": bucket,
-            "key": key,
-            "request_id": context.request_id
+            "num_records": len(records),
+            "keys": [record['s3']['object']['key'] for record in records],
+            "request_id": context.aws_request_id
         })
 
-        # Initialize generator
-        generator = EmbeddingGenerator()
+        # Get (cached) generator
+        generator = _get_generator()
 
-        # Step 1: Read ticket from S3
-        ticket_data = generator.read_ticket_from_s3(bucket, key)
-        ticket_data['s3_key'] = key  # Store for later use
+        with ThreadPoolExecutor(max_workers=max(2, min(MAX_EMBEDDING_WORKERS, len(records) + 1))) as executor:
+            # Warm up the Pinecone client while S3 and Bedrock calls are in flight
+            index_future = executor.submit(_get_index)
 
-        # Step 2: Prepare embedding text
-        embedding_text = generator.prepare_embedding_text(ticket_data)
+            # Steps 1-3: Read, prepare and embed each ticket concurrently
+            embedded = list(executor.map(lambda record: embed_record(generator, record), records))
+            index_future.result()
 
-        # Step 3: Generate embedding
-        embedding = generator.generate_embedding(embedding_text)
+            # Step 4: Store all embeddings in Pinecone (the workflow assumes
+            # the embedding exists, so this completes before step 5)
+            generator.store_in_pinecone(embedded, now=start_time)
 
-        # Step 4: Store in Pinecone
-        generator.store_in_pinecone(ticket_data, embedding)
-
-        # Step 5: Trigger Step Function
-        execution_arn = generator.trigger_step_function(ticket_data)
+            # Step 5: Trigger Step Function per ticket, concurrently
+            execution_arns = list(executor.map(
+                lambda index, item: generator.trigger_step_function(item[0], now=start_time, index=index),
+                range(len(embedded)),
+                embedded
+            ))
+        ticket_ids = [ticket_data.get('ticket', {}).get('id') for ticket_data, _ in embedded]
 
         # Calculate duration
         duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
 
-        publish_metric(
+        put_cloudwatch_metric(
             namespace='EmbeddingGenerator',
             metric_name='ProcessingDuration',
             value=duration_ms,
             unit='Milliseconds'
         )
 
-        publish_metric(
+        put_cloudwatch_metric(
             namespace='EmbeddingGenerator',
             metric_name='Success',
             value=1,
@@ -342,18 +461,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
         logger.info("Embedding generation completed successfully", extra={
-            "ticket_id": ticket_data.get('ticket', {}).get('id'),
+            "ticket_ids": ticket_ids,
             "duration_ms": duration_ms,
-            "execution_arn": execution_arn
+            "execution_arns": execution_arns
         })
 
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Embedding generated successfully',
-                'ticket_id': ticket_data.get('ticket', {}).get('id'),
-                'execution_arn': execution_arn
-            })
+            'body': orjson.dumps({
+                'message': 'Embeddings generated successfully',
+                'ticket_ids': ticket_ids,
+                'execution_arns': execution_arns
+            }).decode()
         }
 
     except Exception as e:
@@ -365,7 +484,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "duration_ms": duration_ms
         }, exc_info=True)
 
-        publish_metric(
+        put_cloudwatch_metric(
             namespace='EmbeddingGenerator',
             metric_name='Failure',
             value=1,
@@ -374,3 +493,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Re-raise to trigger Lambda retry
         raise
+
+    finally:
+        # Metrics are buffered; a frozen container cannot flush them later
+        flush_metrics()
@@ -10,23 +10,127 @@ This Lambda function supports hybrid workflow:
 6. Returns formatted JSON to API Gateway
 """
 
+import base64
 import json
 import os
+import re
 import boto3
-from typing import Dict, Any
-import logging
+from botocore.config import Config
+from typing import Dict, Any, Optional
 
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# Import shared utilities (Lambda Layer)
+import sys
+sys.path.insert(0, '/opt/python')  # Lambda Layer path
+
+from logging_config import StructuredLogger, log_lambda_event
 
-# Initialize Bedrock Agent client
-bedrock_agent_runtime = boto3.client('bedrock-agent-runtime')
+# Configure logging
+logger = StructuredLogger(__name__)
+
+# Initialize Bedrock Agent client (reused across warm invocations; keep-alive
+# preserves the TLS session, adaptive retries back off on throttling)
+bedrock_agent_runtime = boto3.client(
+    'bedrock-agent-runtime',
+    config=Config(
+        retries={'mode': 'adaptive', 'max_attempts': 3},
+        tcp_keepalive=True,
+        max_pool_connections=1,
+        connect_timeout=3,
+        read_timeout=60
+    )
+)
 
 # Configuration from environment variables
 AGENT_ID = os.environ['BEDROCK_AGENT_ID']
 AGENT_ALIAS_ID = os.environ['BEDROCK_AGENT_ALIAS_ID']
 
+# Agent response patterns, compiled once per container
+# Extract FDEs from markdown format like:
+# **1. Joseph (joseph@doit.com) - Confidence: 0.95**
+# - **Expertise:** PostgreSQL, SQL Tuning, ...
+# - **Reasoning:** Joseph holds multiple...
+_FDE_RE = re.compile(
+    r'\*\*(\d+)\.\s+([^(]+)\s*\(([^)]+)\)\s*-\s*Confidence:\s*([\d.]+)\*\*\s*\n\s*-\s*\*\*Expertise:\*\*([^\n]+)\n\s*-\s*\*\*Reasoning:\*\*([^\n]+(?:\n(?!\*\*\d+\.|\n\n)[^\n]+)*)',
+    re.MULTILINE | re.DOTALL
+)
+# Numbered items in the "Similar Resolved Tickets" section
+_TICKETS_SECTION_RE = re.compile(r'\*\*Similar Resolved Tickets:\*\*(.+?)(?=\n\n\n\n\n|\*\*Workflow Mode|\Z)', re.DOTALL)
+# Pattern: 1. **Title** - Resolution details...
+_TICKET_RE = re.compile(r'(\d+)\.\s+\*\*([^\*]+)\*\*\s+-\s+([^\n]+(?:\n(?!\d+\.).[^\n]+)*)')
+_WORKFLOW_RE = re.compile(r'\*\*Workflow Mode\*\*:\s*([^\n]+)')
+
+
+def _extract_json_span(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} span in text, or None.
+
+    Single forward scan tracking brace depth; braces inside JSON string
+    literals (including escaped quotes) are ignored.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+def _parse_markdown(text: str, result: Dict[str, Any]) -> None:
+    """
+    Fill result from the agent's markdown format (fallback when no JSON).
+
+    FDE blocks, the similar-tickets section and the workflow line are
+    scanned independently, so their order in the text does not matter.
+    """
+    for match in _FDE_RE.finditer(text):
+        # Parse expertise list
+        expertise = [e.strip() for e in match.group(5).strip().split(',')]
+
+        result['recommended_fdes'].append({
+            'name': match.group(2).strip(),
+            'email': match.group(3).strip(),
+            'slack_id': '',  # Not included in this format
+            'expertise': expertise,
+            'confidence': float(match.group(4).strip()),
+            'reasoning': match.group(6).strip()
+        })
+
+    # Extract similar tickets section
+    similar_tickets_section = _TICKETS_SECTION_RE.search(text)
+    if similar_tickets_section:
+        for tmatch in _TICKET_RE.finditer(similar_tickets_section.group(1)):
+            result['similar_tickets'].append({
+                'ticket_id': 'N/A',
+                'subject': tmatch.group(2).strip(),
+                'resolution': tmatch.group(3).strip(),
+                'similarity_score': 0.85  # Default score
+            })
+
+    # Extract workflow mode
+    workflow_match = _WORKFLOW_RE.search(text)
+    if workflow_match:
+        result['workflow_mode'] = workflow_match.group(1).strip()
+
 
 def parse_agent_response(response_stream) -> Dict[str, Any]:
     """
@@ -35,8 +139,6 @@ def parse_agent_response(response_stream) -> Dict[str, Any]:
     The agent returns streaming chunks that need to be assembled.
     We extract the final result from the completion event.
     """
-    import re
-
     result = {
         'recommended_fdes': [],
         'similar_tickets': [],
@@ -47,82 +149,35 @@ def parse_agent_response(response_stream) -> Dict[str, Any]:
     completion_text = ""
 
     try:
-        # Process streaming events
+        # Process streaming events; collect raw bytes and decode once so a
+        # multi-byte character split across chunks decodes correctly
+        chunks = []
         for event in response_stream:
             if 'chunk' in event:
                 chunk = event['chunk']
                 if 'bytes' in chunk:
-                    completion_text += chunk['bytes'].decode('utf-8')
+                    chunks.append(chunk['bytes'])
+        completion_text = b''.join(chunks).decode('utf-8')
 
-        logger.info(f"Agent completion text: {completion_text}")
+        logger.info("Agent completion text: %s", completion_text)
 
         # Try to extract JSON first (preferred format)
         if completion_text:
-            json_match = re.search(r'\{.*\}', completion_text, re.DOTALL)
-            if json_match:
+            json_span = _extract_json_span(completion_text)
+            if json_span:
                 try:
-                    parsed_result = json.loads(json_match.group())
+                    parsed_result = json.loads(json_span)
                     result.update(parsed_result)
                     return result
                 except json.JSONDecodeError:
                     pass  # Fall through to markdown parsing
 
         # If no JSON found, parse markdown format
-        # Extract FDEs from markdown format like:
-        # **1. Joseph (joseph@doit.com) - Confidence: 0.95**
-        # - **Expertise:** PostgreSQL, SQL Tuning, ...
-        # - **Reasoning:** Joseph holds multiple...
-        fde_pattern = r'\*\*(\d+)\.\s+([^(]+)\s*\(([^)]+)\)\s*-\s*Confidence:\s*([\d.]+)\*\*\s*\n\s*-\s*\*\*Expertise:\*\*([^\n]+)\n\s*-\s*\*\*Reasoning:\*\*([^\n]+(?:\n(?!\*\*\d+\.|\n\n)[^\n]+)*)'
-
-        fde_matches = re.finditer(fde_pattern, completion_text, re.MULTILINE | re.DOTALL)
-
-        for match in fde_matches:
-            name = match.group(2).strip()
-            email = match.group(3).strip()
-            confidence = float(match.group(4).strip())
-            expertise_str = match.group(5).strip()
-            reasoning = match.group(6).strip()
-
-            # Parse expertise list
-            expertise = [e.strip() for e in expertise_str.split(',')]
-
-            result['recommended_fdes'].append({
-                'name': name,
-                'email': email,
-                'slack_id': '',  # Not included in this format
-                'expertise': expertise,
-                'confidence': confidence,
-                'reasoning': reasoning
-            })
-
-        # Extract similar tickets section
-        # Look for numbered items in "Similar Resolved Tickets" section
-        similar_tickets_section = re.search(r'\*\*Similar Resolved Tickets:\*\*(.+?)(?=\n\n\n\n\n|\*\*Workflow Mode|\Z)', completion_text, re.DOTALL)
-        if similar_tickets_section:
-            similar_text = similar_tickets_section.group(1)
-            # Pattern: 1. **Title** - Resolution details...
-            ticket_pattern = r'(\d+)\.\s+\*\*([^\*]+)\*\*\s+-\s+([^\n]+(?:\n(?!\d+\.).[^\n]+)*)'
-            ticket_matches = re.finditer(ticket_pattern, similar_text)
-
-            for tmatch in ticket_matches:
-                ticket_subject = tmatch.group(2).strip()
-                ticket_resolution = tmatch.group(3).strip()
-
-                result['similar_tickets'].append({
-                    'ticket_id': 'N/A',
-                    'subject': ticket_subject,
-                    'resolution': ticket_resolution,
-                    'similarity_score': 0.85  # Default score
-                })
-
-        # Extract workflow mode
-        workflow_match = re.search(r'\*\*Workflow Mode\*\*:\s*([^\n]+)', completion_text)
-        if workflow_match:
-            result['workflow_mode'] = workflow_match.group(1).strip()
+        _parse_markdown(completion_text, result)
 
     except Exception as e:
         logger.error(f"Error parsing agent response: {str(e)}")
-        logger.error(f"Completion text was: {completion_text}")
+        logger.error("Completion text was: %s", completion_text)
 
     return result
 
@@ -149,16 +204,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     2. ticket_id + ticket_description: Try full workflow, fallback to description
     3. ticket_description only: Use description-based workflow directly
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    log_lambda_event(logger, event, context)
 
     try:
         # Parse request body - handle both API Gateway and Lambda Function URL formats
-        if 'body' in event:
-            # API Gateway format (body is JSON string)
-            body = json.loads(event.get('body', '{}'))
-        else:
-            # Lambda Function URL format (direct JSON)
+        raw_body = event.get('body')
+        if raw_body is None:
+            # Direct invocation format (event is the JSON payload)
             body = event
+        else:
+            # HTTP format (body is a JSON string, possibly base64-encoded);
+            # json.loads accepts bytes, so no separate decode pass is needed
+            if event.get('isBase64Encoded'):
+                raw_body = base64.b64decode(raw_body)
+            body = json.loads(raw_body)
 
         ticket_id = body.get('ticket_id')
         ticket_description = body.get('ticket_description')
@@ -176,7 +235,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
 
-        logger.info(f"Processing - ticket_id: {ticket_id}, has_description: {bool(ticket_description)}")
+        logger.info("Processing - ticket_id: %s, has_description: %s", ticket_id, bool(ticket_description))
 
         # Generate unique session ID
         session_id = f"session-{ticket_id or 'desc'}-{context.aws_request_id}"
@@ -193,8 +252,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             agent_input = f"Find FDEs based on this ticket description: {ticket_description}. Search for similar resolved tickets in the knowledge base and recommend 3 FDEs whose expertise best matches this issue. Provide reasoning for each recommendation. Do NOT attempt to fetch from Zendesk or create Slack conversations."
 
         # Invoke Bedrock Agent
-        logger.info(f"Invoking Bedrock Agent (ID: {AGENT_ID}, Alias: {AGENT_ALIAS_ID})")
-        logger.info(f"Agent input: {agent_input}")
+        logger.info("Invoking Bedrock Agent (ID: %s, Alias: %s)", AGENT_ID, AGENT_ALIAS_ID)
+        logger.info("Agent input: %s", agent_input)
 
         response = bedrock_agent_runtime.invoke_agent(
             agentId=AGENT_ID,
@@ -211,8 +270,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if ticket_id:
             result['ticket_id'] = ticket_id
 
-        logger.info(f"Successfully processed request")
-        logger.info(f"Result: {json.dumps(result)}")
+        # Serialize once for both the log line and the response body
+        result_body = json.dumps(result)
+
+        logger.info("Successfully processed request")
+        logger.info("Result: %s", result_body)
 
         # Return success response
         return {
@@ -221,7 +283,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps(result)
+            'body': result_body
         }
 
     except bedrock_agent_runtime.exceptions.ThrottlingException:
@@ -9,11 +9,14 @@ Event Source: Zendesk Webhook (API Gateway)
 Output: S3 ticket storage + Lambda invocation
 """
 
+import base64
+import binascii
 import json
 import hmac
 import hashlib
-from datetime import datetime
-from typing import Dict, Any
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 # Import shared utilities (Lambda Layer)
 import sys
@@ -29,15 +32,38 @@ from constants import (
     ErrorMessage
 )
 
-from zendesk_client import ZendeskClient
 from validator import validate_ticket_data
 
 
-# Initialize clients
-aws_clients = AWSClients()
-metrics = MetricsCollector()
+# Initialize logger; service clients are built lazily by _get_deps()
 logger = StructuredLogger(__name__)
 
+# HMAC keyed with the webhook secret; copied per request so the key pads are
+# derived only once per container
+_HMAC_TEMPLATE = (
+    hmac.new(ZENDESK_WEBHOOK_SECRET.encode('utf-8'), digestmod=hashlib.sha256)
+    if ZENDESK_WEBHOOK_SECRET else None
+)
+_SIGNATURE_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+@lru_cache(maxsize=1)
+def _get_deps() -> Tuple[AWSClients, MetricsCollector, Any]:
+    """
+    Build the service clients on the first accepted webhook.
+
+    Rejected requests (bad signature, missing ticket_id) never pay for them;
+    the cache keeps them, including the Zendesk session and its
+    connection pool, across warm invocations.
+
+    Returns:
+        Tuple of (AWSClients, MetricsCollector, ZendeskClient)
+    """
+    # Imported here so rejected webhooks never load the requests stack
+    from zendesk_client import ZendeskClient
+
+    return AWSClients(), MetricsCollector(), ZendeskClient()
+
 
 @track_latency("TicketIngestion")
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -54,6 +80,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     # Set up logging with context
     log_lambda_event(logger, event, context)
 
+    ingested_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
     try:
         # Step 1: Validate webhook signature
         if not validate_webhook_signature(event):
@@ -78,7 +106,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info(f"Processing ticket ingestion for ticket_id: {ticket_id}")
 
         # Step 3: Fetch full ticket context from Zendesk
-        zendesk_client = ZendeskClient()
+        aws_clients, metrics, zendesk_client = _get_deps()
         ticket_data = zendesk_client.get_ticket_with_context(ticket_id)
 
         # Step 4: Validate ticket data
@@ -93,37 +121,48 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "body": json.dumps({"error": "Invalid ticket data", "details": validation_errors})
             }
 
+        # Fields reused by storage, the embedding payload, metrics and logs
+        customer_id = (ticket_data.get("requester") or {}).get("id")
+        customer_id_str = str(customer_id) if customer_id is not None else "unknown"
+        priority = ticket_data.get("priority") or "unknown"
+
         # Step 5: Store raw ticket in S3
         s3_key = get_s3_ticket_key(ticket_id)
-        store_ticket_in_s3(ticket_data, s3_key)
+        size_bytes = store_ticket_in_s3(aws_clients, ticket_data, s3_key, customer_id_str, priority, ingested_at)
 
         # Step 6: Trigger embedding generation Lambda
         embedding_lambda_payload = {
             "ticket_id": ticket_id,
             "s3_bucket": S3_BUCKET_TICKETS,
             "s3_key": s3_key,
-            "customer_id": ticket_data.get("requester", {}).get("id"),
+            "customer_id": customer_id,
             "priority": ticket_data.get("priority")
         }
 
         invoke_lambda(
             function_name="embedding-generator",
             payload=embedding_lambda_payload,
-            invocation_type="Event"  # Async invocation
+            invocation_type="Event",  # Async invocation
+            aws_clients=aws_clients
         )
 
-        # Step 7: Record metrics
+        # Step 7: Record metrics (published by track_latency's flush)
         metrics.record_ticket_ingested(
             ticket_id=str(ticket_id),
-            customer_id=str(ticket_data.get("requester", {}).get("id"))
+            customer_id=customer_id_str
         )
 
+        # Single summary record for the whole ingestion
         logger.info(
             f"Successfully ingested ticket {ticket_id}",
             extra={
                 "ticket_id": ticket_id,
                 "s3_key": s3_key,
-                "customer_id": ticket_data.get("requester", {}).get("id")
+                "size_bytes": size_bytes,
+                "customer_id": customer_id,
+                "priority": priority,
+                "num_comments": len(ticket_data.get("comments") or []),
+                "ingested_at": ingested_at
             }
         )
 
@@ -151,6 +190,26 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
 
 
+def _decode_signature(signature: str) -> Optional[bytes]:
+    """
+    Decode a webhook signature header to raw digest bytes.
+
+    Zendesk sends base64; a 64-character hex digest is also accepted.
+
+    Args:
+        signature: Signature header value
+
+    Returns:
+        Digest bytes, or None if the value is malformed
+    """
+    try:
+        if len(signature) == 2 * _SIGNATURE_DIGEST_SIZE:
+            return bytes.fromhex(signature)
+        return base64.b64decode(signature, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+
+
 def validate_webhook_signature(event: Dict[str, Any]) -> bool:
     """
     Validate Zendesk webhook signature using HMAC-SHA256.
@@ -170,24 +229,29 @@ def validate_webhook_signature(event: Dict[str, Any]) -> bool:
             logger.warning("Missing signature or timestamp in webhook")
             return False
 
-        # Reconstruct the signing string
-        body = event.get("body", "")
-        signing_string = timestamp + body
+        if _HMAC_TEMPLATE is None:
+            logger.error("ZENDESK_WEBHOOK_SECRET is not configured")
+            return False
+
+        # Reject malformed signatures before doing any HMAC work
+        received_digest = _decode_signature(signature)
+        if received_digest is None or len(received_digest) != _SIGNATURE_DIGEST_SIZE:
+            logger.warning("Malformed webhook signature")
+            return False
 
-        # Calculate expected signature
-        expected_signature = hmac.new(
-            key=ZENDESK_WEBHOOK_SECRET.encode('utf-8'),
-            msg=signing_string.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).hexdigest()
+        # Sign timestamp + body without building the concatenated string
+        body = event.get("body", "")
+        mac = _HMAC_TEMPLATE.copy()
+        mac.update(timestamp.encode('utf-8'))
+        mac.update(body.encode('utf-8') if isinstance(body, str) else body)
 
-        # Compare signatures
-        is_valid = hmac.compare_digest(signature, expected_signature)
+        # Compare raw 32-byte digests in constant time
+        is_valid = hmac.compare_digest(mac.digest(), received_digest)
 
         if not is_valid:
             logger.warning(
                 "Webhook signature mismatch",
-                extra={"expected": expected_signature[:8], "received": signature[:8]}
+                extra={"received": signature[:8]}
             )
 
         return is_valid
@@ -211,7 +275,6 @@ def parse_webhook_payload(event: Dict[str, Any]) -> Dict[str, Any]:
 
     # Handle base64 encoding from API Gateway
     if event.get("isBase64Encoded"):
-        import base64
         body = base64.b64decode(body).decode('utf-8')
 
     payload = json.loads(body)
@@ -221,40 +284,63 @@ def parse_webhook_payload(event: Dict[str, Any]) -> Dict[str, Any]:
     return payload
 
 
-def store_ticket_in_s3(ticket_data: Dict[str, Any], s3_key: str):
+def store_ticket_in_s3(
+    aws_clients: AWSClients,
+    ticket_data: Dict[str, Any],
+    s3_key: str,
+    customer_id: str,
+    priority: str,
+    ingested_at: str
+) -> int:
     """
     Store raw ticket data in S3 with metadata.
 
     Args:
+        aws_clients: AWSClients instance
         ticket_data: Full ticket context from Zendesk
         s3_key: S3 key for storage
+        customer_id: Requester ID as a string (S3 metadata values must be strings)
+        priority: Ticket priority, "unknown" if unset
+        ingested_at: ISO-8601 UTC timestamp of this ingestion
+
+    Returns:
+        Size of the stored object in bytes
     """
     try:
-        # Add processing metadata
-        ticket_data["_metadata"] = {
-            "ingested_at": datetime.utcnow().isoformat() + "Z",
-            "source": "zendesk_webhook",
-            "version": "1.0"
+        # Add processing metadata to a shallow copy; the caller's dict is
+        # left untouched
+        document = {
+            **ticket_data,
+            "_metadata": {
+                "ingested_at": ingested_at,
+                "source": "zendesk_webhook",
+                "version": "1.0"
+            }
         }
 
+        # Serialize once, compactly (no indentation whitespace)
+        body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+
         # Upload to S3
         aws_clients.s3.put_object(
             Bucket=S3_BUCKET_TICKETS,
             Key=s3_key,
-            Body=json.dumps(ticket_data, indent=2),
+            Body=body,
             ContentType="application/json",
             Metadata={
                 "ticket_id": str(ticket_data.get("id")),
-                "customer_id": str(ticket_data.get("requester", {}).get("id")),
-                "priority": ticket_data.get("priority", "unknown")
+                "customer_id": customer_id,
+                "priority": priority
             }
         )
 
-        logger.info(
+        logger.debug(
             f"Stored ticket in S3: {s3_key}",
-            extra={"s3_bucket": S3_BUCKET_TICKETS, "s3_key": s3_key}
+            extra={"s3_bucket": S3_BUCKET_TICKETS, "s3_key": s3_key, "size_bytes": len(body)}
         )
 
+        return len(body)
+
     except Exception as e:
         logger.error(
             f"Failed to store ticket in S3: {str(e)}",
@@ -15,10 +15,18 @@ from constants import (
 )
 
 
+# Sentinel distinguishing an absent key from a present-but-empty value
+_MISSING = object()
+
+_REQUIRED_FIELDS = ("id", "subject", "description", "requester", "tags")
+
+
 def validate_ticket_data(ticket_data: Dict[str, Any]) -> List[str]:
     """
     Validate ticket data structure and content.
 
+    Each field is looked up once and the checks run against locals.
+
     Args:
         ticket_data: Ticket context dict from Zendesk
 
@@ -27,48 +35,51 @@ def validate_ticket_data(ticket_data: Dict[str, Any]) -> List[str]:
     """
     errors = []
 
+    get = ticket_data.get
+    ticket_id = get("id", _MISSING)
+    subject = get("subject", _MISSING)
+    description = get("description", _MISSING)
+    requester = get("requester", _MISSING)
+    tags = get("tags", _MISSING)
+    comments = get("comments", _MISSING)
+
     # Required fields
-    required_fields = ["id", "subject", "description", "requester", "tags"]
-    for field in required_fields:
-        if field not in ticket_data or not ticket_data[field]:
+    for field, value in zip(_REQUIRED_FIELDS, (ticket_id, subject, description, requester, tags)):
+        if value is _MISSING or not value:
             errors.append(f"Missing required field: {field}")
 
-    # Validate ticket ID
-    if "id" in ticket_data:
-        ticket_id = ticket_data["id"]
-        if not isinstance(ticket_id, (int, str)) or str(ticket_id).strip() == "":
+    # Validate ticket ID (ints are always valid; strings must be non-blank)
+    if ticket_id is not _MISSING:
+        if isinstance(ticket_id, str):
+            if not ticket_id.strip():
+                errors.append("Invalid ticket ID")
+        elif not isinstance(ticket_id, int):
             errors.append("Invalid ticket ID")
 
     # Validate description length
-    if "description" in ticket_data:
-        description = ticket_data["description"]
-        if description:
-            desc_length = len(description)
-            if desc_length < MIN_TICKET_DESCRIPTION_LENGTH:
-                errors.append(f"Description too short (min: {MIN_TICKET_DESCRIPTION_LENGTH} chars)")
-            elif desc_length > MAX_TICKET_DESCRIPTION_LENGTH:
-                errors.append(f"Description too long (max: {MAX_TICKET_DESCRIPTION_LENGTH} chars)")
+    if description is not _MISSING and description:
+        desc_length = len(description)
+        if desc_length < MIN_TICKET_DESCRIPTION_LENGTH:
+            errors.append(f"Description too short (min: {MIN_TICKET_DESCRIPTION_LENGTH} chars)")
+        elif desc_length > MAX_TICKET_DESCRIPTION_LENGTH:
+            errors.append(f"Description too long (max: {MAX_TICKET_DESCRIPTION_LENGTH} chars)")
 
     # Validate requester
-    if "requester" in ticket_data:
-        requester = ticket_data["requester"]
+    if requester is not _MISSING:
         if not isinstance(requester, dict):
             errors.append("Invalid requester format")
-        elif "id" not in requester or not requester["id"]:
+        elif not requester.get("id"):
             errors.append("Missing requester ID")
 
     # Validate tags (must contain "need_sme" tag)
-    if "tags" in ticket_data:
-        tags = ticket_data["tags"]
+    if tags is not _MISSING:
         if not isinstance(tags, list):
             errors.append("Tags must be a list")
         elif "need_sme" not in tags:
             errors.append("Ticket does not have 'need_sme' tag")
 
     # Validate comments
-    if "comments" in ticket_data:
-        comments = ticket_data["comments"]
-        if not isinstance(comments, list):
-            errors.append("Comments must be a list")
+    if comments is not _MISSING and not isinstance(comments, list):
+        errors.append("Comments must be a list")
 
     return errors
@@ -5,8 +5,14 @@ This module provides a clean interface to the Zendesk API with
 proper error handling, retries, and rate limiting.
 """
 
+import random
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from time import sleep
 
 import sys
@@ -17,6 +23,32 @@ from constants import ZENDESK_DOMAIN, ZENDESK_EMAIL, ZENDESK_API_TOKEN
 
 logger = StructuredLogger(__name__)
 
+# (connect, read) timeout for each Zendesk API call
+REQUEST_TIMEOUT = (3.0, 10.0)
+
+# Upper bound on a single backoff sleep between retries
+MAX_BACKOFF_SECONDS = 30.0
+
+# Comment fields kept in the stored ticket context
+_COMMENT_KEYS = ("id", "author_id", "body", "created_at", "public")
+
+# Ticket fields already copied to the top level of the context; raw_ticket
+# keeps only the remainder
+_PROJECTED_TICKET_KEYS = frozenset({
+    "id", "subject", "description", "status", "priority", "tags",
+    "created_at", "updated_at", "custom_fields"
+})
+
+# Zendesk's maximum page size for offset pagination
+COMMENTS_PER_PAGE = 100
+
+# Users (mostly recurring assignees) cached per container, shared by all
+# ZendeskClient instances: {user_id: (fetched_at, user)}, in LRU order
+USER_CACHE_TTL_SECONDS = 300
+USER_CACHE_MAX_ENTRIES = 256
+_user_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_user_cache_lock = threading.Lock()
+
 
 class ZendeskClient:
     """
@@ -36,6 +68,8 @@ class ZendeskClient:
         self.session = requests.Session()
         self.session.auth = (f"{self.email}/token", self.api_token)
         self.session.headers.update({"Content-Type": "application/json"})
+        # One host, up to four concurrent calls in get_ticket_with_context
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
     def get_ticket_with_context(self, ticket_id: str) -> Dict[str, Any]:
         """
@@ -52,19 +86,24 @@ class ZendeskClient:
         """
         logger.info(f"Fetching ticket {ticket_id} from Zendesk")
 
-        # Fetch main ticket data
-        ticket = self._get_ticket(ticket_id)
-
-        # Fetch ticket comments
-        comments = self._get_ticket_comments(ticket_id)
-
-        # Fetch requester details
-        requester_id = ticket.get("requester_id")
-        requester = self._get_user(requester_id) if requester_id else {}
-
-        # Fetch assignee details (current CRE)
-        assignee_id = ticket.get("assignee_id")
-        assignee = self._get_user(assignee_id) if assignee_id else {}
+        # Requests share self.session (and its connection pool); the ticket
+        # and comments are fetched together, then both users together
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # Fetch main ticket data and comments concurrently
+            ticket_future = executor.submit(self._get_ticket, ticket_id)
+            comments_future = executor.submit(self._get_ticket_comments, ticket_id)
+            ticket = ticket_future.result()
+
+            # Fetch requester and assignee (current CRE) details while
+            # comments may still be in flight
+            requester_id = ticket.get("requester_id")
+            assignee_id = ticket.get("assignee_id")
+            requester_future = executor.submit(self._get_user, requester_id) if requester_id else None
+            assignee_future = executor.submit(self._get_user, assignee_id) if assignee_id else None
+
+            comments = comments_future.result()
+            requester = requester_future.result() if requester_future else {}
+            assignee = assignee_future.result() if assignee_future else {}
 
         # Construct full context
         ticket_context = {
@@ -88,20 +127,15 @@ class ZendeskClient:
                 "email": assignee.get("email")
             },
             "comments": [
-                {
-                    "id": comment.get("id"),
-                    "author_id": comment.get("author_id"),
-                    "body": comment.get("body"),
-                    "created_at": comment.get("created_at"),
-                    "public": comment.get("public")
-                }
+                {key: comment.get(key) for key in _COMMENT_KEYS}
                 for comment in comments
             ],
             "custom_fields": ticket.get("custom_fields", []),
-            "raw_ticket": ticket  # Keep full ticket for reference
+            # Keep remaining ticket fields for reference
+            "raw_ticket": {k: v for k, v in ticket.items() if k not in _PROJECTED_TICKET_KEYS}
         }
 
-        logger.info(
+        logger.debug(
             f"Successfully fetched ticket {ticket_id}",
             extra={
                 "ticket_id": ticket_id,
@@ -128,7 +162,7 @@ class ZendeskClient:
 
     def _get_ticket_comments(self, ticket_id: str) -> List[Dict[str, Any]]:
         """
-        Fetch all comments for a ticket.
+        Fetch all comments for a ticket, following pagination.
 
         Args:
             ticket_id: Zendesk ticket ID
@@ -136,13 +170,18 @@ class ZendeskClient:
         Returns:
             List of comment dicts
         """
-        url = f"{self.base_url}/tickets/{ticket_id}/comments.json"
-        response = self._make_request("GET", url)
-        return response.get("comments", [])
+        comments = []
+        url = f"{self.base_url}/tickets/{ticket_id}/comments.json?per_page={COMMENTS_PER_PAGE}"
+        while url:
+            response = self._make_request("GET", url)
+            comments.extend(response.get("comments", []))
+            url = response.get("next_page")
+        return comments
 
     def _get_user(self, user_id: str) -> Dict[str, Any]:
         """
-        Fetch user details from Zendesk.
+        Fetch user details from Zendesk, served from the module cache when
+        fetched within the last USER_CACHE_TTL_SECONDS.
 
         Args:
             user_id: Zendesk user ID
@@ -150,9 +189,27 @@ class ZendeskClient:
         Returns:
             User data dict
         """
+        cache_key = str(user_id)
+        now = time.monotonic()
+
+        with _user_cache_lock:
+            cached = _user_cache.get(cache_key)
+            if cached and now - cached[0] < USER_CACHE_TTL_SECONDS:
+                _user_cache.move_to_end(cache_key)
+                return cached[1]
+
         url = f"{self.base_url}/users/{user_id}.json"
         response = self._make_request("GET", url)
-        return response.get("user", {})
+        user = response.get("user", {})
+
+        if user:
+            with _user_cache_lock:
+                _user_cache[cache_key] = (now, user)
+                _user_cache.move_to_end(cache_key)
+                while len(_user_cache) > USER_CACHE_MAX_ENTRIES:
+                    _user_cache.popitem(last=False)
+
+        return user
 
     def _make_request(
         self,
@@ -176,7 +233,7 @@ class ZendeskClient:
         """
         for attempt in range(max_retries):
             try:
-                response = self.session.request(method, url)
+                response = self.session.request(method, url, timeout=REQUEST_TIMEOUT)
 
                 # Handle rate limiting
                 if response.status_code == 429:
@@ -207,7 +264,8 @@ class ZendeskClient:
                     logger.error(f"All Zendesk API retries exhausted for {url}")
                     raise
 
-                # Exponential backoff
-                sleep(2 ** attempt)
+                # Exponential backoff with jitter so concurrent invocations
+                # don't retry in lockstep
+                sleep(min(MAX_BACKOFF_SECONDS, (2 ** attempt) * (0.5 + random.random() * 0.5)))
 
         raise requests.exceptions.RequestException("Max retries exceeded")
@@ -5,9 +5,16 @@ This package contains reusable modules for AWS clients, logging,
 metrics, and configuration.
 """
 
-from .aws_clients import AWSClients, aws_clients, get_secret
+from .aws_clients import (
+    AWSClients,
+    aws_clients,
+    flush_metrics,
+    get_client,
+    get_dropped_metric_count,
+    get_secret
+)
 from .logging_config import StructuredLogger, with_logging
-from .metrics import MetricsCollector, metrics_collector, track_latency
+from .metrics import Dimension, MetricsCollector, metrics_collector, track_latency
 from .constants import (
     AWS_REGION,
     BEDROCK_MODEL_ID,
@@ -24,13 +31,17 @@ __all__ = [
     # AWS Clients
     "AWSClients",
     "aws_clients",
+    "get_client",
     "get_secret",
+    "flush_metrics",
+    "get_dropped_metric_count",
 
     # Logging
     "StructuredLogger",
     "with_logging",
 
     # Metrics
+    "Dimension",
     "MetricsCollector",
     "metrics_collector",
     "track_latency",
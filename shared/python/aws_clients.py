@@ -6,14 +6,43 @@ used in the SME Finder system, with proper error handling and retries.
 """
 
 import boto3
+import botocore.session
 from botocore.config import Config
-from botocore.exceptions import ClientError
-from typing import Optional
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+import atexit
+import collections
 import json
-
-from constants import AWS_REGION, ENABLE_XRAY_TRACING
+import threading
+import time
+
+from constants import (
+    AWS_REGION,
+    ENABLE_XRAY_TRACING,
+    METRIC_FLUSH_INTERVAL_SECONDS,
+    METRIC_FLUSH_THRESHOLD,
+    METRIC_QUEUE_MAX_SIZE,
+    PREWARM_AWS_CLIENTS,
+    SECRET_CACHE_TTL_SECONDS,
+)
 from logging_config import StructuredLogger
 
+# orjson is several times faster on the multi-KB payloads passed to Lambda and
+# Step Functions; fall back to the stdlib where it is not packaged
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+
 logger = StructuredLogger(__name__)
 
 
@@ -21,103 +50,288 @@ logger = StructuredLogger(__name__)
 # Boto3 Configuration
 # ============================================================================
 
-# Standard retry configuration with exponential backoff
+# Standard retry configuration with exponential backoff. Used for S3, Lambda,
+# Step Functions, Secrets Manager and CloudWatch, which are rarely throttled,
+# so adaptive mode's client-side rate limiting would only add latency.
 RETRY_CONFIG = Config(
     region_name=AWS_REGION,
     retries={
         'max_attempts': 3,
-        'mode': 'adaptive'  # Adaptive retry mode for better resilience
+        'mode': 'standard'
     },
     max_pool_connections=50,  # Connection pooling for Lambda/ECS
+    tcp_keepalive=True,  # Keep pooled connections alive across idle gaps between invocations
+    connect_timeout=3,
+    read_timeout=60  # Synchronous Lambda invokes can legitimately run long
+)
+
+# Adaptive retry configuration for quota-throttled services (Bedrock)
+ADAPTIVE_RETRY_CONFIG = Config(
+    region_name=AWS_REGION,
+    retries={
+        'max_attempts': 5,
+        'mode': 'adaptive'  # Client-side rate limiting backs off under throttling
+    },
+    max_pool_connections=20,
+    tcp_keepalive=True,
     connect_timeout=5,
     read_timeout=60
 )
 
+# Services that use a config other than RETRY_CONFIG
+_SERVICE_CONFIGS = {
+    'bedrock-runtime': ADAPTIVE_RETRY_CONFIG,
+}
+
 
 # ============================================================================
 # Client Initialization
 # ============================================================================
 
+# One session for every client: credentials and loaded service data are
+# resolved once instead of once per client. The botocore session is created
+# explicitly so prewarm_clients() can use it without boto3 internals.
+_BOTOCORE_SESSION = botocore.session.get_session()
+_SESSION = boto3.session.Session(botocore_session=_BOTOCORE_SESSION, region_name=AWS_REGION)
+
+# boto3 service name -> client, plus a per-service lock so concurrent first
+# calls build each client exactly once without serializing other services
+_CLIENTS: dict = {}
+_CLIENT_LOCKS: dict[str, threading.Lock] = {}
+_CLIENT_LOCKS_GUARD = threading.Lock()
+
+# Services prewarm_clients() builds ahead of the first request
+PREWARM_SERVICES = (
+    's3',
+    'bedrock-runtime',
+    'stepfunctions',
+    'secretsmanager',
+    'cloudwatch',
+    'lambda',
+)
+
+
+def get_client(service_name: str):
+    """
+    Get or create the shared boto3 client for a service.
+
+    Args:
+        service_name: boto3 service name (e.g. "s3", "bedrock-runtime")
+
+    Returns:
+        boto3 client configured with the service's retry config
+    """
+    client = _CLIENTS.get(service_name)
+    if client is not None:
+        return client
+
+    with _CLIENT_LOCKS_GUARD:
+        lock = _CLIENT_LOCKS.setdefault(service_name, threading.Lock())
+
+    with lock:
+        client = _CLIENTS.get(service_name)
+        if client is None:
+            client = _SESSION.client(
+                service_name,
+                config=_SERVICE_CONFIGS.get(service_name, RETRY_CONFIG)
+            )
+            _CLIENTS[service_name] = client
+            logger.debug("Initialized %s client", service_name)
+
+    return client
+
+
+def prewarm_clients(services: tuple[str, ...] = PREWARM_SERVICES, max_workers: int = 6):
+    """
+    Construct clients for several services concurrently.
+
+    Client construction is dominated by service-model loading, so
+    building them in parallel turns cold-start cost from the sum of
+    all client inits into roughly the slowest one. get_client() remains
+    the fallback for anything not prewarmed.
+
+    Args:
+        services: boto3 service names to build
+        max_workers: Maximum number of clients built at once
+    """
+    missing = [name for name in services if name not in _CLIENTS]
+    if not missing:
+        return
+
+    # Resolve credentials and the service-data loader up front so the
+    # workers below do not race to build them when creating clients
+    for component in ('credential_provider', 'data_loader'):
+        _BOTOCORE_SESSION.get_component(component)
+    _SESSION.get_credentials()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+        list(executor.map(get_client, missing))
+
+    logger.debug("Prewarmed AWS clients", extra={"clients": missing})
+
+
+def get_s3_client():
+    """Get the shared S3 client."""
+    return get_client('s3')
+
+
+def get_bedrock_runtime_client():
+    """Get the shared Bedrock Runtime client."""
+    return get_client('bedrock-runtime')
+
+
+def get_sfn_client():
+    """Get the shared Step Functions client."""
+    return get_client('stepfunctions')
+
+
 class AWSClients:
     """
-    Singleton class for managing AWS service clients with connection pooling.
+    Attribute-style access to the shared AWS service clients.
+
+    Holds no state of its own: every property delegates to get_client(),
+    so all instances share the same clients and connection pools.
 
     Usage:
         clients = AWSClients()
         response = clients.s3.put_object(Bucket="my-bucket", Key="key", Body=data)
     """
 
-    _instance = None
-    _clients = {}
-
-    def __new__(cls):
-        """Singleton pattern to reuse clients across Lambda invocations."""
-        if cls._instance is None:
-            cls._instance = super(AWSClients, cls).__new__(cls)
-        return cls._instance
-
     @property
     def s3(self):
         """Get or create S3 client."""
-        if 's3' not in self._clients:
-            self._clients['s3'] = boto3.client('s3', config=RETRY_CONFIG)
-            logger.debug("Initialized S3 client")
-        return self._clients['s3']
+        return get_client('s3')
 
     @property
     def bedrock_runtime(self):
         """Get or create Bedrock Runtime client."""
-        if 'bedrock_runtime' not in self._clients:
-            self._clients['bedrock_runtime'] = boto3.client(
-                'bedrock-runtime',
-                config=RETRY_CONFIG
-            )
-            logger.debug("Initialized Bedrock Runtime client")
-        return self._clients['bedrock_runtime']
+        return get_client('bedrock-runtime')
 
     @property
     def stepfunctions(self):
         """Get or create Step Functions client."""
-        if 'stepfunctions' not in self._clients:
-            self._clients['stepfunctions'] = boto3.client(
-                'stepfunctions',
-                config=RETRY_CONFIG
-            )
-            logger.debug("Initialized Step Functions client")
-        return self._clients['stepfunctions']
+        return get_client('stepfunctions')
 
     @property
     def secretsmanager(self):
         """Get or create Secrets Manager client."""
-        if 'secretsmanager' not in self._clients:
-            self._clients['secretsmanager'] = boto3.client(
-                'secretsmanager',
-                config=RETRY_CONFIG
-            )
-            logger.debug("Initialized Secrets Manager client")
-        return self._clients['secretsmanager']
+        return get_client('secretsmanager')
 
     @property
     def cloudwatch(self):
         """Get or create CloudWatch client."""
-        if 'cloudwatch' not in self._clients:
-            self._clients['cloudwatch'] = boto3.client(
-                'cloudwatch',
-                config=RETRY_CONFIG
-            )
-            logger.debug("Initialized CloudWatch client")
-        return self._clients['cloudwatch']
+        return get_client('cloudwatch')
 
     @property
     def lambda_client(self):
         """Get or create Lambda client."""
-        if 'lambda' not in self._clients:
-            self._clients['lambda'] = boto3.client(
-                'lambda',
-                config=RETRY_CONFIG
+        return get_client('lambda')
+
+    def prewarm(self, max_workers: int = 6):
+        """Construct all service clients concurrently (see prewarm_clients)."""
+        prewarm_clients(max_workers=max_workers)
+
+
+# ============================================================================
+# Secret Cache
+# ============================================================================
+
+# Parsed secrets reused across warm invocations: {secret_name: (fetched_at, secret_dict)}
+_SECRET_CACHE: dict[str, tuple[float, dict]] = {}
+_SECRET_CACHE_LOCK = threading.Lock()
+
+
+def _cache_secret(secret_name: str, secret_dict: dict):
+    """Store a parsed secret in the process-local cache."""
+    with _SECRET_CACHE_LOCK:
+        _SECRET_CACHE[secret_name] = (time.monotonic(), secret_dict)
+
+
+def _get_cached_secret(secret_name: str) -> Optional[dict]:
+    """Return a copy of a cached secret if it is younger than the TTL."""
+    with _SECRET_CACHE_LOCK:
+        entry = _SECRET_CACHE.get(secret_name)
+    if entry and time.monotonic() - entry[0] < SECRET_CACHE_TTL_SECONDS:
+        return dict(entry[1])
+    return None
+
+
+# ============================================================================
+# Metric Buffer
+# ============================================================================
+
+# PutMetricData accepts at most 1000 datums per call
+METRIC_BATCH_SIZE = 1000
+
+
+class _MetricRecord:
+    """Compact queued metric; the API dict is only built at flush time."""
+
+    __slots__ = ('namespace', 'name', 'value', 'unit', 'dimensions', 'timestamp')
+
+    def __init__(self, namespace, name, value, unit, dimensions):
+        self.namespace = namespace
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.dimensions = dimensions
+        # Stamp now so a delayed flush does not shift the datapoint
+        self.timestamp = time.time()
+
+    def to_datum(self) -> dict:
+        """Build the PutMetricData MetricDatum for this record."""
+        datum = {
+            'MetricName': self.name,
+            'Value': self.value,
+            'Unit': self.unit,
+            'Timestamp': self.timestamp
+        }
+        if self.dimensions:
+            # metrics.Dimension tuples become the {"Name", "Value"} dicts
+            # the API expects; plain dicts pass through
+            datum['Dimensions'] = [
+                dimension if isinstance(dimension, dict) else dimension._asdict()
+                for dimension in self.dimensions
+            ]
+        return datum
+
+
+# Pending _MetricRecords awaiting flush_metrics(); bounded by
+# METRIC_QUEUE_MAX_SIZE so a stalled CloudWatch cannot grow memory
+_METRIC_Q = collections.deque()
+_METRIC_LOCK = threading.Lock()
+_METRIC_FLUSH_EVENT = threading.Event()
+_metric_flusher: Optional[threading.Thread] = None
+
+# Metrics rejected because the queue was full (cumulative, and since the
+# last flush so each drop is reported once)
+_metrics_dropped = 0
+_metrics_dropped_unreported = 0
+
+
+def _metric_flush_loop():
+    """Flush buffered metrics every interval, or sooner when the buffer fills."""
+    while True:
+        _METRIC_FLUSH_EVENT.wait(METRIC_FLUSH_INTERVAL_SECONDS)
+        _METRIC_FLUSH_EVENT.clear()
+        try:
+            flush_metrics()
+        except Exception as e:
+            logger.warning("Background metric flush failed", extra={"error": str(e)})
+
+
+def _ensure_metric_flusher():
+    """Start the background flusher on first use."""
+    global _metric_flusher
+    if _metric_flusher is not None:
+        return
+
+    with _METRIC_LOCK:
+        if _metric_flusher is None:
+            _metric_flusher = threading.Thread(
+                target=_metric_flush_loop, name="metric-flusher", daemon=True
             )
-            logger.debug("Initialized Lambda client")
-        return self._clients['lambda']
+            _metric_flusher.start()
 
 
 # ============================================================================
@@ -128,31 +342,39 @@ def get_secret(secret_name: str, aws_clients: Optional[AWSClients] = None) -> di
     """
     Retrieve secret from AWS Secrets Manager.
 
+    Results are cached in-process for SECRET_CACHE_TTL_SECONDS, so warm
+    invocations skip the Secrets Manager round-trip.
+
     Args:
         secret_name: Name of the secret
         aws_clients: Optional AWSClients instance (creates new if not provided)
 
     Returns:
-        Dict containing secret key-value pairs
+        Dict containing secret key-value pairs (a copy; safe to mutate)
 
     Raises:
         ClientError: If secret retrieval fails
     """
+    cached = _get_cached_secret(secret_name)
+    if cached is not None:
+        return cached
+
     if aws_clients is None:
         aws_clients = AWSClients()
 
     try:
-        logger.info(f"Retrieving secret: {secret_name}")
+        logger.info("Retrieving secret: %s", secret_name)
 
         response = aws_clients.secretsmanager.get_secret_value(
             SecretId=secret_name
         )
 
         # Parse the secret string (stored as JSON)
-        secret_dict = json.loads(response['SecretString'])
+        secret_dict = _loads(response['SecretString'])
+        _cache_secret(secret_name, secret_dict)
 
-        logger.info(f"Successfully retrieved secret: {secret_name}")
-        return secret_dict
+        logger.info("Successfully retrieved secret: %s", secret_name)
+        return dict(secret_dict)
 
     except ClientError as e:
         error_code = e.response['Error']['Code']
@@ -170,20 +392,28 @@ def put_cloudwatch_metric(
     metric_name: str,
     value: float,
     namespace: str,
-    dimensions: Optional[list[dict]] = None,
+    dimensions: Optional[Sequence[dict]] = None,
     unit: str = "None",
     aws_clients: Optional[AWSClients] = None
 ):
     """
-    Publish custom metric to CloudWatch.
+    Queue a custom metric for publishing to CloudWatch.
+
+    Metrics are buffered and sent in batches by a background thread every
+    METRIC_FLUSH_INTERVAL_SECONDS, or once METRIC_FLUSH_THRESHOLD are
+    pending. Lambda handlers should call flush_metrics() before returning,
+    since a frozen container cannot run the background flush. When
+    METRIC_QUEUE_MAX_SIZE records are already pending the metric is
+    dropped rather than blocking the caller (see get_dropped_metric_count).
 
     Args:
         metric_name: Metric name
         value: Metric value
         namespace: CloudWatch namespace
-        dimensions: List of dimension dicts [{"Name": "x", "Value": "y"}]
+        dimensions: Dimension dicts [{"Name": "x", "Value": "y"}] or
+            metrics.Dimension tuples
         unit: Metric unit (Seconds, Count, Bytes, etc.)
-        aws_clients: Optional AWSClients instance
+        aws_clients: Unused; kept for compatibility (see flush_metrics)
 
     Example:
         put_cloudwatch_metric(
@@ -194,42 +424,108 @@ def put_cloudwatch_metric(
             unit="Count"
         )
     """
-    if aws_clients is None:
-        aws_clients = AWSClients()
-
-    try:
-        metric_data = {
-            'MetricName': metric_name,
-            'Value': value,
-            'Unit': unit
+    global _metrics_dropped, _metrics_dropped_unreported
+
+    record = _MetricRecord(namespace, metric_name, value, unit, dimensions)
+
+    _ensure_metric_flusher()
+
+    with _METRIC_LOCK:
+        pending = len(_METRIC_Q)
+        if pending >= METRIC_QUEUE_MAX_SIZE:
+            _metrics_dropped += 1
+            _metrics_dropped_unreported += 1
+        else:
+            _METRIC_Q.append(record)
+            pending += 1
+
+    if pending >= METRIC_FLUSH_THRESHOLD:
+        _METRIC_FLUSH_EVENT.set()
+
+    logger.debug(
+        "Queued CloudWatch metric: %s",
+        metric_name,
+        extra={
+            "metric_name": metric_name,
+            "value": value,
+            "namespace": namespace
         }
+    )
 
-        if dimensions:
-            metric_data['Dimensions'] = dimensions
 
-        aws_clients.cloudwatch.put_metric_data(
-            Namespace=namespace,
-            MetricData=[metric_data]
-        )
+def flush_metrics(aws_clients: Optional[AWSClients] = None) -> int:
+    """
+    Publish all buffered metrics, grouped by namespace.
 
-        logger.debug(
-            f"Published CloudWatch metric: {metric_name}",
-            extra={
-                "metric_name": metric_name,
-                "value": value,
-                "namespace": namespace
-            }
-        )
+    Args:
+        aws_clients: Optional AWSClients instance
 
-    except ClientError as e:
+    Returns:
+        Number of metric datums successfully published
+    """
+    global _metrics_dropped_unreported
+
+    with _METRIC_LOCK:
+        pending = list(_METRIC_Q)
+        _METRIC_Q.clear()
+        dropped = _metrics_dropped_unreported
+        _metrics_dropped_unreported = 0
+
+    if dropped:
         logger.warning(
-            f"Failed to publish CloudWatch metric: {metric_name}",
-            extra={
-                "metric_name": metric_name,
-                "error": str(e)
-            }
+            "Dropped %d CloudWatch metrics: queue full",
+            dropped,
+            extra={"dropped": dropped, "max_queue_size": METRIC_QUEUE_MAX_SIZE}
         )
-        # Don't raise - metrics publishing should not break main flow
+
+    if not pending:
+        return 0
+
+    if aws_clients is None:
+        aws_clients = AWSClients()
+
+    by_namespace: dict[str, list[dict]] = {}
+    for record in pending:
+        by_namespace.setdefault(record.namespace, []).append(record.to_datum())
+
+    published = 0
+    for namespace, metric_data in by_namespace.items():
+        for start in range(0, len(metric_data), METRIC_BATCH_SIZE):
+            batch = metric_data[start:start + METRIC_BATCH_SIZE]
+            try:
+                aws_clients.cloudwatch.put_metric_data(
+                    Namespace=namespace,
+                    MetricData=batch
+                )
+                published += len(batch)
+
+            except (ClientError, BotoCoreError) as e:
+                # Connection errors and timeouts surface as BotoCoreError;
+                # flush runs in handlers' finally blocks, so never raise here
+                logger.warning(
+                    "Failed to publish CloudWatch metrics batch",
+                    extra={
+                        "namespace": namespace,
+                        "batch_size": len(batch),
+                        "error": str(e)
+                    }
+                )
+
+    logger.debug(
+        "Flushed CloudWatch metrics",
+        extra={"published": published, "queued": len(pending)}
+    )
+    return published
+
+
+def get_dropped_metric_count() -> int:
+    """
+    Return how many metrics were dropped because the buffer was full.
+
+    Returns:
+        Cumulative count since the process started
+    """
+    return _metrics_dropped
 
 
 def start_step_function_execution(
@@ -259,7 +555,7 @@ def start_step_function_execution(
     try:
         params = {
             'stateMachineArn': state_machine_arn,
-            'input': json.dumps(input_data)
+            'input': _dumps(input_data).decode('utf-8')
         }
 
         if execution_name:
@@ -319,11 +615,12 @@ def invoke_lambda(
         response = aws_clients.lambda_client.invoke(
             FunctionName=function_name,
             InvocationType=invocation_type,
-            Payload=json.dumps(payload)
+            Payload=_dumps(payload)
         )
 
         logger.info(
-            f"Invoked Lambda function: {function_name}",
+            "Invoked Lambda function: %s",
+            function_name,
             extra={
                 "function_name": function_name,
                 "invocation_type": invocation_type,
@@ -333,7 +630,7 @@ def invoke_lambda(
 
         # Parse response for synchronous invocations
         if invocation_type == "RequestResponse":
-            response_payload = json.loads(response['Payload'].read())
+            response_payload = _loads(response['Payload'].read())
             return response_payload
 
         return None
@@ -368,3 +665,13 @@ if ENABLE_XRAY_TRACING:
 
 # Pre-initialize clients for Lambda warm starts
 aws_clients = AWSClients()
+
+# Publish whatever is still buffered when the process shuts down
+atexit.register(flush_metrics)
+
+if PREWARM_AWS_CLIENTS:
+    try:
+        prewarm_clients(PREWARM_AWS_CLIENTS)
+    except Exception as e:
+        # get_client() creates clients lazily, so a failed prewarm only costs latency
+        logger.warning("Failed to prewarm AWS clients", extra={"error": str(e)})
@@ -5,15 +5,17 @@ This module provides production-grade error handling for AWS Bedrock API calls,
 including throttling detection, exponential backoff, and circuit breaker pattern.
 """
 
+import random
+import threading
 import time
-from functools import wraps
-from typing import Callable, Any
+from functools import lru_cache, wraps
+from typing import Callable, Any, Optional
 from enum import Enum
-from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
 
 from logging_config import StructuredLogger
 from constants import (
+    BedrockModel,
     BEDROCK_MAX_RETRIES,
     BEDROCK_BACKOFF_MULTIPLIER,
     BEDROCK_BACKOFF_MAX
@@ -34,7 +36,9 @@ class CircuitBreaker:
     Circuit breaker pattern for cascading failure prevention.
 
     Automatically opens circuit after threshold failures, preventing
-    further requests until timeout period expires.
+    further requests until timeout period expires. Safe to share across
+    threads: state transitions happen under a lock, and timing uses the
+    monotonic clock.
     """
 
     def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 60):
@@ -49,24 +53,38 @@ class CircuitBreaker:
         self.timeout_seconds = timeout_seconds
         self.state = CircuitState.CLOSED
         self.failure_count = 0
-        self.last_failure_time = None
+        self.last_failure_time = None  # time.monotonic() of the last failure
+        self._lock = threading.Lock()
 
     def record_success(self):
         """Record successful operation, reset failure count."""
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
+        # Fast path: nothing to reset while healthy
+        if self.state == CircuitState.CLOSED and self.failure_count == 0:
+            return
+
+        with self._lock:
+            self.failure_count = 0
+            self.state = CircuitState.CLOSED
         logger.debug("Circuit breaker: Success recorded, circuit closed")
 
     def record_failure(self):
         """Record failed operation, potentially open circuit."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.utcnow()
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            failure_count = self.failure_count
+            opened = (
+                failure_count >= self.failure_threshold
+                and self.state != CircuitState.OPEN
+            )
+            if failure_count >= self.failure_threshold:
+                self.state = CircuitState.OPEN
 
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitState.OPEN
+        if opened:
             logger.warning(
-                f"Circuit breaker: Opened after {self.failure_count} failures",
-                extra={"failure_count": self.failure_count}
+                "Circuit breaker: Opened after %d failures",
+                failure_count,
+                extra={"failure_count": failure_count}
             )
 
     def can_execute(self) -> bool:
@@ -76,26 +94,69 @@ class CircuitBreaker:
         Returns:
             True if operation can proceed, False otherwise
         """
+        # Lock-free read for the common, healthy case
         if self.state == CircuitState.CLOSED:
             return True
 
-        if self.state == CircuitState.OPEN:
-            if self.last_failure_time:
-                elapsed = (datetime.utcnow() - self.last_failure_time).seconds
-                if elapsed > self.timeout_seconds:
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if (
+                    self.last_failure_time is not None
+                    and time.monotonic() - self.last_failure_time > self.timeout_seconds
+                ):
                     self.state = CircuitState.HALF_OPEN
-                    logger.info("Circuit breaker: Entering half-open state")
-                    return True
+                    entered_half_open = True
+                else:
+                    entered_half_open = False
+            else:
+                return True
 
-            logger.warning("Circuit breaker: Open, rejecting request")
-            return False
+        if entered_half_open:
+            logger.info("Circuit breaker: Entering half-open state")
+            return True
 
-        return self.state == CircuitState.HALF_OPEN
+        logger.warning("Circuit breaker: Open, rejecting request")
+        return False
 
 
 # Global circuit breaker instance for Bedrock API
 bedrock_circuit_breaker = CircuitBreaker(failure_threshold=5, timeout_seconds=60)
 
+# Seeded once per container; jitter needs spread, not cryptographic quality
+_RANDOM = random.Random()
+
+# First backoff step in seconds, before BEDROCK_BACKOFF_MULTIPLIER is applied
+_BASE_WAIT_SECONDS = 1
+
+# Bedrock error codes worth retrying with backoff
+_RETRYABLE_ERRORS = frozenset({
+    'ThrottlingException',
+    'ServiceUnavailableException',
+    'ModelTimeoutException',
+    'TooManyRequestsException'
+})
+
+# Bedrock error codes that will fail the same way on retry
+_NON_RETRYABLE_ERRORS = frozenset({
+    'ValidationException',
+    'AccessDeniedException',
+    'ResourceNotFoundException'
+})
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: uniform in [0, min(cap, base * mul^attempt)].
+
+    Randomizing the whole interval keeps concurrent Lambdas that were
+    throttled together from retrying in lockstep.
+    """
+    ceiling = min(
+        BEDROCK_BACKOFF_MAX,
+        _BASE_WAIT_SECONDS * (BEDROCK_BACKOFF_MULTIPLIER ** attempt)
+    )
+    return _RANDOM.uniform(0, ceiling)
+
 
 def handle_bedrock_throttling(func: Callable) -> Callable:
     """
@@ -115,13 +176,13 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
     """
     @wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        base_wait_time = 1
+        # Check circuit breaker once per call; within the retry loop a
+        # failure is only recorded right before giving up, so the state
+        # cannot have been opened by this call between attempts
+        if not bedrock_circuit_breaker.can_execute():
+            raise Exception("Circuit breaker open, Bedrock API unavailable")
 
         for attempt in range(BEDROCK_MAX_RETRIES):
-            # Check circuit breaker
-            if not bedrock_circuit_breaker.can_execute():
-                raise Exception("Circuit breaker open, Bedrock API unavailable")
-
             try:
                 result = func(*args, **kwargs)
                 bedrock_circuit_breaker.record_success()
@@ -133,7 +194,8 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
 
                 # Log error details
                 logger.warning(
-                    f"Bedrock API error: {error_code}",
+                    "Bedrock API error: %s",
+                    error_code,
                     extra={
                         "error_code": error_code,
                         "error_message": error_message,
@@ -143,12 +205,7 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
                 )
 
                 # Handle throttling and retryable errors
-                if error_code in [
-                    'ThrottlingException',
-                    'ServiceUnavailableException',
-                    'ModelTimeoutException',
-                    'TooManyRequestsException'
-                ]:
+                if error_code in _RETRYABLE_ERRORS:
                     if attempt == BEDROCK_MAX_RETRIES - 1:
                         bedrock_circuit_breaker.record_failure()
                         logger.error(
@@ -157,14 +214,11 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
                         )
                         raise
 
-                    # Calculate wait time with exponential backoff
-                    wait_time = min(
-                        base_wait_time * (BEDROCK_BACKOFF_MULTIPLIER ** attempt),
-                        BEDROCK_BACKOFF_MAX
-                    )
+                    wait_time = _backoff_delay(attempt)
 
                     logger.info(
-                        f"Bedrock throttled, retrying in {wait_time}s",
+                        "Bedrock throttled, retrying in %.2fs",
+                        wait_time,
                         extra={
                             "attempt": attempt + 1,
                             "wait_time": wait_time,
@@ -176,11 +230,7 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
                     continue
 
                 # Non-retryable errors
-                elif error_code in [
-                    'ValidationException',
-                    'AccessDeniedException',
-                    'ResourceNotFoundException'
-                ]:
+                elif error_code in _NON_RETRYABLE_ERRORS:
                     logger.error(
                         f"Non-retryable Bedrock error: {error_code}",
                         extra={
@@ -215,11 +265,7 @@ def handle_bedrock_throttling(func: Callable) -> Callable:
                     bedrock_circuit_breaker.record_failure()
                     raise
 
-                wait_time = min(
-                    base_wait_time * (BEDROCK_BACKOFF_MULTIPLIER ** attempt),
-                    BEDROCK_BACKOFF_MAX
-                )
-                time.sleep(wait_time)
+                time.sleep(_backoff_delay(attempt))
 
         # Should not reach here, but handle gracefully
         raise Exception(f"Max retries ({BEDROCK_MAX_RETRIES}) exceeded")
@@ -249,42 +295,116 @@ def validate_bedrock_response(response: dict) -> dict:
     return response
 
 
+# Pricing as of 2025, USD per 1M tokens: (input, output, cache read, cache write)
+_PRICING = {
+    BedrockModel.CLAUDE_SONNET_4_5.value: (3.00, 15.00, 0.30, 3.75),
+    BedrockModel.TITAN_EMBEDDINGS_V2.value: (0.02, 0.0, 0.0, 0.0),
+}
+
+# Fallback for model IDs not listed above (other regions, inference profiles)
+_PRICING_BY_FAMILY = (
+    ("claude-sonnet", _PRICING[BedrockModel.CLAUDE_SONNET_4_5.value]),
+    ("titan-embed", _PRICING[BedrockModel.TITAN_EMBEDDINGS_V2.value]),
+)
+
+
+@lru_cache(maxsize=32)
+def _pricing_for(model_id: str) -> Optional[tuple]:
+    """Resolve per-1M pricing for a model ID not listed in _PRICING, once per ID."""
+    lowered = model_id.lower()
+    for family, family_pricing in _PRICING_BY_FAMILY:
+        if family in lowered:
+            return family_pricing
+
+    logger.warning("Unknown model ID for cost calculation: %s", model_id)
+    return None
+
+
 def calculate_bedrock_cost(
     model_id: str,
     input_tokens: int,
-    output_tokens: int = 0
+    output_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0
 ) -> float:
     """
     Calculate estimated cost for Bedrock API call.
 
     Args:
         model_id: Bedrock model identifier
-        input_tokens: Number of input tokens
+        input_tokens: Number of uncached input tokens
         output_tokens: Number of output tokens (0 for embeddings)
+        cache_read_tokens: Input tokens served from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
 
     Returns:
         Estimated cost in USD
     """
-    # Pricing as of 2025 (per 1M tokens)
-    CLAUDE_SONNET_4_5_PRICING = {
-        "input_per_1m": 3.00,
-        "output_per_1m": 15.00
+    # Exact IDs hit the plain dict; anything else is resolved once and cached
+    pricing = _PRICING.get(model_id) or _pricing_for(model_id)
+    if pricing is None:
+        return 0.0
+
+    input_per_1m, output_per_1m, cache_read_per_1m, cache_write_per_1m = pricing
+    return round(
+        (
+            input_tokens * input_per_1m
+            + output_tokens * output_per_1m
+            + cache_read_tokens * cache_read_per_1m
+            + cache_write_tokens * cache_write_per_1m
+        ) / 1_000_000,
+        6
+    )
+
+
+def _claude_token_usage(response: dict) -> dict:
+    """Claude models return usage, including prompt-cache tokens, in the response body."""
+    usage = response.get("usage", {})
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cache_read_tokens = usage.get("cache_read_input_tokens", 0)
+    cache_write_tokens = usage.get("cache_creation_input_tokens", 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_input_tokens": cache_read_tokens,
+        "cache_creation_input_tokens": cache_write_tokens,
+        "total_tokens": input_tokens + output_tokens + cache_read_tokens + cache_write_tokens
     }
 
-    TITAN_EMBEDDINGS_PRICING = {
-        "input_per_1m": 0.02
+
+def _titan_embed_token_usage(response: dict) -> dict:
+    """Titan embeddings only have input tokens."""
+    input_tokens = response.get("inputTextTokenCount", 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": 0,
+        "cache_read_input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+        "total_tokens": input_tokens
     }
 
-    if "claude-sonnet" in model_id.lower():
-        input_cost = (input_tokens / 1_000_000) * CLAUDE_SONNET_4_5_PRICING["input_per_1m"]
-        output_cost = (output_tokens / 1_000_000) * CLAUDE_SONNET_4_5_PRICING["output_per_1m"]
-        return round(input_cost + output_cost, 6)
 
-    elif "titan-embed" in model_id.lower():
-        return round((input_tokens / 1_000_000) * TITAN_EMBEDDINGS_PRICING["input_per_1m"], 6)
+# Extractors for the configured model IDs, matched without any string work
+_TOKEN_USAGE_BY_MODEL_ID = {
+    BedrockModel.CLAUDE_SONNET_4_5.value: _claude_token_usage,
+    BedrockModel.TITAN_EMBEDDINGS_V2.value: _titan_embed_token_usage,
+}
 
-    logger.warning(f"Unknown model ID for cost calculation: {model_id}")
-    return 0.0
+_TOKEN_USAGE_EXTRACTORS = (
+    ("claude", _claude_token_usage),
+    ("titan-embed", _titan_embed_token_usage),
+)
+
+
+@lru_cache(maxsize=32)
+def _token_usage_extractor(model_id: str) -> Optional[Callable[[dict], dict]]:
+    """Pick the usage extractor for any other model ID, once per ID."""
+    lowered = model_id.lower()
+    for family, extractor in _TOKEN_USAGE_EXTRACTORS:
+        if family in lowered:
+            return extractor
+    return None
 
 
 def extract_token_usage(response: dict, model_id: str) -> dict:
@@ -296,25 +416,20 @@ def extract_token_usage(response: dict, model_id: str) -> dict:
         model_id: Model identifier
 
     Returns:
-        Dict with input_tokens, output_tokens, total_tokens
+        Dict with input_tokens, output_tokens, cache_read_input_tokens,
+        cache_creation_input_tokens and total_tokens
     """
-    try:
-        if "claude" in model_id.lower():
-            # Claude models return usage in response
-            usage = response.get("usage", {})
-            return {
-                "input_tokens": usage.get("input_tokens", 0),
-                "output_tokens": usage.get("output_tokens", 0),
-                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
-            }
-        elif "titan-embed" in model_id.lower():
-            # Titan embeddings only have input tokens
-            return {
-                "input_tokens": response.get("inputTextTokenCount", 0),
-                "output_tokens": 0,
-                "total_tokens": response.get("inputTextTokenCount", 0)
-            }
-    except Exception as e:
-        logger.warning(f"Failed to extract token usage: {str(e)}")
-
-    return {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    extractor = _TOKEN_USAGE_BY_MODEL_ID.get(model_id) or _token_usage_extractor(model_id)
+    if extractor is not None:
+        try:
+            return extractor(response)
+        except Exception as e:
+            logger.warning("Failed to extract token usage: %s", e)
+
+    return {
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+        "total_tokens": 0
+    }
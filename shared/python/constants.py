@@ -6,6 +6,8 @@ across Lambda functions and ECS tasks.
 """
 
 import os
+import time
+from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -127,6 +129,9 @@ class Environment(Enum):
 
 ENVIRONMENT = os.getenv("ENVIRONMENT", Environment.DEVELOPMENT.value)
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_BUFFER_ENABLED = os.getenv("LOG_BUFFER_ENABLED", "false").lower() == "true"
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "128"))
+LOG_BUFFER_LEVEL = os.getenv("LOG_BUFFER_LEVEL", "DEBUG")
 MAX_CONCURRENT_EXECUTIONS = int(os.getenv("MAX_CONCURRENT_EXECUTIONS", "10"))
 RAG_TIMEOUT_SECONDS = int(os.getenv("RAG_TIMEOUT_SECONDS", "300"))
 
@@ -136,7 +141,14 @@ RAG_TIMEOUT_SECONDS = int(os.getenv("RAG_TIMEOUT_SECONDS", "300"))
 
 ENABLE_FEEDBACK_LOOP = os.getenv("ENABLE_FEEDBACK_LOOP", "true").lower() == "true"
 ENABLE_COST_TRACKING = os.getenv("ENABLE_COST_TRACKING", "true").lower() == "true"
+ENABLE_PIPELINE_METRICS = os.getenv("ENABLE_PIPELINE_METRICS", "true").lower() == "true"
+ENABLE_BUSINESS_METRICS = os.getenv("ENABLE_BUSINESS_METRICS", "true").lower() == "true"
 ENABLE_XRAY_TRACING = os.getenv("ENABLE_XRAY_TRACING", "true").lower() == "true"
+# Comma-separated boto3 services to build at import (e.g. "s3,stepfunctions");
+# empty by default so each function opts in to only the clients it uses
+PREWARM_AWS_CLIENTS = tuple(
+    name.strip() for name in os.getenv("PREWARM_AWS_CLIENTS", "").split(",") if name.strip()
+)
 
 # ============================================================================
 # Performance Tuning
@@ -145,6 +157,10 @@ ENABLE_XRAY_TRACING = os.getenv("ENABLE_XRAY_TRACING", "true").lower() == "true"
 VECTOR_SEARCH_TOP_K = int(os.getenv("VECTOR_SEARCH_TOP_K", "20"))
 MIN_CONFIDENCE_THRESHOLD = float(os.getenv("MIN_CONFIDENCE_THRESHOLD", "0.60"))
 MAX_SME_RECOMMENDATIONS = int(os.getenv("MAX_SME_RECOMMENDATIONS", "3"))
+SECRET_CACHE_TTL_SECONDS = int(os.getenv("SECRET_CACHE_TTL", "300"))
+METRIC_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRIC_FLUSH_INTERVAL_SECONDS", "20"))
+METRIC_FLUSH_THRESHOLD = int(os.getenv("METRIC_FLUSH_THRESHOLD", "500"))
+METRIC_QUEUE_MAX_SIZE = int(os.getenv("METRIC_QUEUE_MAX_SIZE", "10000"))
 
 # ============================================================================
 # Cost Limits
@@ -248,6 +264,30 @@ EXPONENTIAL_BACKOFF_BASE = 2  # seconds
 # Helper Functions
 # ============================================================================
 
+# (epoch second, "year=YYYY/month=MM", "day=DD") for the current UTC second
+_DATE_PARTITION_CACHE: tuple[int, str, str] = (-1, "", "")
+
+# Only the partition varies per call; the prefix is baked in at import
+_FEEDBACK_KEY_TEMPLATE = S3Prefix.FEEDBACK + "/%s/feedback-data.jsonl"
+
+
+def _date_partition() -> tuple[str, str]:
+    """
+    Return the current UTC ("year=YYYY/month=MM", "day=DD") partition parts.
+
+    Rebuilt at most once per second, so bursts of key generation share
+    one datetime construction.
+    """
+    global _DATE_PARTITION_CACHE
+    now_sec = int(time.time())
+    cached = _DATE_PARTITION_CACHE
+    if cached[0] != now_sec:
+        now = datetime.fromtimestamp(now_sec, timezone.utc)
+        cached = (now_sec, "year=%d/month=%02d" % (now.year, now.month), "day=%02d" % now.day)
+        _DATE_PARTITION_CACHE = cached
+    return cached[1], cached[2]
+
+
 def get_s3_ticket_key(ticket_id: str, prefix: str = S3Prefix.RAW_TICKETS) -> str:
     """
     Generate S3 key for ticket storage with date partitioning.
@@ -259,9 +299,8 @@ def get_s3_ticket_key(ticket_id: str, prefix: str = S3Prefix.RAW_TICKETS) -> str
     Returns:
         S3 key string with date partitioning
     """
-    from datetime import datetime
-    now = datetime.utcnow()
-    return f"{prefix}/year={now.year}/month={now.month:02d}/day={now.day:02d}/ticket-{ticket_id}.json"
+    month_partition, day_partition = _date_partition()
+    return "%s/%s/%s/ticket-%s.json" % (prefix, month_partition, day_partition, ticket_id)
 
 
 def get_feedback_key() -> str:
@@ -271,9 +310,19 @@ def get_feedback_key() -> str:
     Returns:
         S3 key string with date partitioning
     """
-    from datetime import datetime
-    now = datetime.utcnow()
-    return f"{S3Prefix.FEEDBACK}/year={now.year}/month={now.month:02d}/feedback-data.jsonl"
+    month_partition, _ = _date_partition()
+    return _FEEDBACK_KEY_TEMPLATE % month_partition
+
+
+_REQUIRED_ENV_VARS = (
+    "AWS_ACCOUNT_ID",
+    "PINECONE_API_KEY",
+    "ZENDESK_DOMAIN",
+    "ZENDESK_API_TOKEN",
+    "ZENDESK_EMAIL",
+    "SLACK_BOT_TOKEN",
+    "SLACK_SIGNING_SECRET"
+)
 
 
 def validate_environment_variables() -> list[str]:
@@ -283,19 +332,5 @@ def validate_environment_variables() -> list[str]:
     Returns:
         List of missing environment variable names (empty if all present)
     """
-    required_vars = [
-        "AWS_ACCOUNT_ID",
-        "PINECONE_API_KEY",
-        "ZENDESK_DOMAIN",
-        "ZENDESK_API_TOKEN",
-        "ZENDESK_EMAIL",
-        "SLACK_BOT_TOKEN",
-        "SLACK_SIGNING_SECRET"
-    ]
-
-    missing = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing.append(var)
-
-    return missing
+    environ = os.environ
+    return [var for var in _REQUIRED_ENV_VARS if not environ.get(var)]
@@ -5,14 +5,75 @@ This module provides JSON-formatted logging with correlation IDs,
 CloudWatch integration, and X-Ray tracing support.
 """
 
+import collections
 import logging
 import json
+import sys
+import threading
+import time
 import uuid
-from datetime import datetime
 from typing import Any, Optional
-from functools import wraps
+from functools import lru_cache, wraps
+
+from constants import (
+    LOG_LEVEL,
+    LOG_BUFFER_ENABLED,
+    LOG_BUFFER_LEVEL,
+    LOG_BUFFER_SIZE,
+    ENVIRONMENT,
+    ENABLE_XRAY_TRACING
+)
+
+# orjson serializes log records several times faster than the stdlib and
+# handles datetimes/UUIDs natively; fall back where it is not packaged
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str, separators=(",", ":"))
+
+# Level names used by StructuredLogger methods, resolved to ints up front
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL
+}
+_DEFAULT_LEVEL = logging.getLevelName(LOG_LEVEL.upper())
+
+# Resolve the X-Ray recorder once instead of importing it on every record
+_xray_recorder = None
+if ENABLE_XRAY_TRACING:
+    try:
+        from aws_xray_sdk.core import xray_recorder as _xray_recorder
+    except Exception:
+        _xray_recorder = None  # X-Ray not available, skip
+
+
+class LoggerBufferConfig:
+    """
+    Settings for buffering verbose log records until an error occurs.
+
+    Records at or below ``buffer_at_verbosity`` are held in a bounded ring
+    buffer instead of being written; an error() or critical() call writes
+    them out first, so failures keep their lead-up context while the
+    success path emits nothing at those levels.
+    """
 
-from constants import LOG_LEVEL, ENVIRONMENT, ENABLE_XRAY_TRACING
+    def __init__(self, max_size: int = LOG_BUFFER_SIZE, buffer_at_verbosity: str = LOG_BUFFER_LEVEL):
+        """
+        Initialize buffer settings.
+
+        Args:
+            max_size: Maximum buffered records; the oldest are dropped first
+            buffer_at_verbosity: Most severe level that is buffered (e.g. "DEBUG", "INFO")
+        """
+        self.max_size = max_size
+        self.buffer_at_verbosity = logging.getLevelName(buffer_at_verbosity.upper())
 
 
 class StructuredLogger:
@@ -24,29 +85,72 @@ class StructuredLogger:
         logger.info("Ticket processed", extra={"ticket_id": "12345"})
     """
 
-    def __init__(self, name: str, correlation_id: Optional[str] = None):
+    def __init__(
+        self,
+        name: str,
+        correlation_id: Optional[str] = None,
+        buffer_config: Optional[LoggerBufferConfig] = None
+    ):
         """
         Initialize structured logger.
 
         Args:
             name: Logger name (typically __name__)
             correlation_id: Optional correlation ID for tracing requests
+            buffer_config: Optional verbose-log buffering; defaults to
+                LOG_BUFFER_* settings when LOG_BUFFER_ENABLED is set
         """
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, LOG_LEVEL))
-        self.correlation_id = correlation_id or str(uuid.uuid4())
+        self.logger.setLevel(_DEFAULT_LEVEL)
+        self._correlation_id = correlation_id
         self.context = {}
 
+        if buffer_config is None and LOG_BUFFER_ENABLED:
+            buffer_config = LoggerBufferConfig()
+        self._buffer = (
+            collections.deque(maxlen=buffer_config.max_size) if buffer_config else None
+        )
+        self._buffer_level = buffer_config.buffer_at_verbosity if buffer_config else None
+
         # Configure JSON formatter
         if not self.logger.handlers:
-            handler = logging.StreamHandler()
+            handler = FastStdoutHandler()
             formatter = JSONFormatter()
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
+            # The Lambda runtime puts its own handler on the root logger;
+            # without this every record would be written twice
+            self.logger.propagate = False
+
+    @property
+    def correlation_id(self) -> str:
+        """Correlation ID for this logger; a UUID is generated on first use."""
+        if self._correlation_id is None:
+            self._correlation_id = str(uuid.uuid4())
+        return self._correlation_id
+
+    @correlation_id.setter
+    def correlation_id(self, correlation_id: Optional[str]):
+        self._correlation_id = correlation_id
 
     def set_correlation_id(self, correlation_id: str):
-        """Set correlation ID for request tracing."""
+        """Set correlation ID for request tracing; starts a new buffer scope."""
         self.correlation_id = correlation_id
+        if self._buffer is not None:
+            self._buffer.clear()
+
+    def flush_buffer(self):
+        """Write out buffered records, bypassing the logger's level."""
+        if not self._buffer:
+            return
+
+        while self._buffer:
+            level_no, message, args, log_data, created = self._buffer.popleft()
+            record = self.logger.makeRecord(
+                self.logger.name, level_no, "(buffered)", 0, message, args, None, extra=log_data
+            )
+            record.created = created
+            self.logger.handle(record)
 
     def add_context(self, **kwargs):
         """
@@ -57,64 +161,151 @@ class StructuredLogger:
         """
         self.context.update(kwargs)
 
-    def _log(self, level: str, message: str, extra: Optional[dict] = None):
+    def _log(
+        self,
+        level: str,
+        message: str,
+        args: tuple = (),
+        extra: Optional[dict] = None,
+        exc_info: bool = False
+    ):
         """
         Internal logging method that enriches log data.
 
         Args:
             level: Log level (info, warning, error, etc.)
-            message: Log message
+            message: Log message, optionally with %-style placeholders
+            args: Values for the placeholders; formatting is deferred until
+                the record is actually emitted
             extra: Additional structured data
+            exc_info: Attach the current exception's traceback
         """
+        level_no = _LEVELS[level]
+        buffered = self._buffer is not None and level_no <= self._buffer_level
+
+        # Skip all enrichment for records the logger would drop anyway
+        if not buffered and not self.logger.isEnabledFor(level_no):
+            return
+
+        # "message" is set by JSONFormatter from the formatted record; it is
+        # also a reserved LogRecord attribute, so it cannot go in extra
         log_data = {
-            "message": message,
             "correlation_id": self.correlation_id,
             "environment": ENVIRONMENT,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
             **self.context,
             **(extra or {})
         }
 
         # Add X-Ray trace ID if available
-        if ENABLE_XRAY_TRACING:
+        if _xray_recorder is not None:
             try:
-                from aws_xray_sdk.core import xray_recorder
-                trace_entity = xray_recorder.get_trace_entity()
+                trace_entity = _xray_recorder.get_trace_entity()
                 if trace_entity:
                     log_data["trace_id"] = trace_entity.trace_id
             except Exception:
-                pass  # X-Ray not available, skip
+                pass  # No active segment, skip
 
-        getattr(self.logger, level)(message, extra=log_data)
+        if buffered:
+            # Keep the original time; the record is only built on flush
+            self._buffer.append((level_no, message, args, log_data, time.time()))
+            return
 
-    def info(self, message: str, extra: Optional[dict] = None):
+        # Give the failure its lead-up context before the error itself
+        if level_no >= logging.ERROR and self._buffer:
+            self.flush_buffer()
+
+        self.logger.log(level_no, message, *args, extra=log_data, exc_info=exc_info)
+
+    def info(self, message: str, *args, extra: Optional[dict] = None):
         """Log info message with structured data."""
-        self._log("info", message, extra)
+        self._log("info", message, args, extra)
 
-    def warning(self, message: str, extra: Optional[dict] = None):
+    def warning(self, message: str, *args, extra: Optional[dict] = None):
         """Log warning message with structured data."""
-        self._log("warning", message, extra)
+        self._log("warning", message, args, extra)
 
-    def error(self, message: str, extra: Optional[dict] = None, exc_info: bool = True):
+    def error(self, message: str, *args, extra: Optional[dict] = None, exc_info: bool = True):
         """
         Log error message with structured data and exception info.
 
         Args:
             message: Error message
+            *args: Values for %-style placeholders in message
             extra: Additional structured data
             exc_info: Include exception traceback (default: True)
         """
-        self._log("error", message, extra)
-        if exc_info:
-            self.logger.exception(message)
+        self._log("error", message, args, extra, exc_info=exc_info)
 
-    def debug(self, message: str, extra: Optional[dict] = None):
+    def debug(self, message: str, *args, extra: Optional[dict] = None):
         """Log debug message with structured data."""
-        self._log("debug", message, extra)
+        self._log("debug", message, args, extra)
 
-    def critical(self, message: str, extra: Optional[dict] = None):
+    def critical(self, message: str, *args, extra: Optional[dict] = None):
         """Log critical message with structured data."""
-        self._log("critical", message, extra)
+        self._log("critical", message, args, extra)
+
+
+class FastStdoutHandler(logging.Handler):
+    """
+    Minimal handler that writes formatted records straight to stdout.
+
+    Lambda ships stdout to CloudWatch as-is, so StreamHandler's
+    terminator/error-handling layers and re-entrant RLock are overhead;
+    this writes each record with a single call under a plain Lock.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Initialize handler.
+
+        Args:
+            stream: Text stream to write to (default: sys.stdout, looked up
+                on each emit so redirection is honored)
+        """
+        super().__init__()
+        self.stream = stream
+
+    def createLock(self):
+        """Use a plain Lock; handle() takes it once around emit()."""
+        # The base method also registers the handler so its lock is
+        # reinitialized in a forked child; keep that, then swap the RLock
+        super().createLock()
+        self.lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord):
+        """Write one formatted record and flush it to CloudWatch promptly."""
+        stream = self.stream or sys.stdout
+        try:
+            stream.write(self.format(record) + "\n")
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_STDLIB_LOGRECORD_KEYS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime"}
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recently formatted second
+_TIMESTAMP_CACHE: tuple[int, str] = (-1, "")
+
+
+def _format_timestamp(created: float) -> str:
+    """
+    Format a LogRecord.created time as ISO-8601 UTC with milliseconds.
+
+    The second-resolution prefix is rebuilt only when the second rolls
+    over, so bursts of records share one strftime call.
+    """
+    global _TIMESTAMP_CACHE
+    sec = int(created)
+    cached = _TIMESTAMP_CACHE
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+        _TIMESTAMP_CACHE = cached
+    return "%s.%03dZ" % (cached[1], int((created - sec) * 1000))
 
 
 class JSONFormatter(logging.Formatter):
@@ -138,17 +329,36 @@ class JSONFormatter(logging.Formatter):
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
+            "timestamp": _format_timestamp(record.created),
         }
 
-        # Add extra fields if present
-        if hasattr(record, "extra"):
-            log_data.update(record.extra)
+        # Add extra fields; logging flattens extra= onto the record itself
+        for key, value in record.__dict__.items():
+            if key not in _STDLIB_LOGRECORD_KEYS:
+                log_data[key] = value
 
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        # Add exception info if present (error() outside an except block
+        # yields (None, None, None))
+        if record.exc_info and record.exc_info[0] is not None:
+            # Cache on the record like logging.Formatter does, so a
+            # traceback is formatted once however many handlers see it
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_data["exception"] = record.exc_text
 
-        return json.dumps(log_data)
+        return _dumps(log_data)
+
+
+@lru_cache(maxsize=256)
+def _get_logger(name: str) -> StructuredLogger:
+    """
+    Return a shared StructuredLogger for a module name.
+
+    Used by decorators so wrapped calls do not construct a new logger
+    (level lookup, UUID, handler check) on every invocation. Per-call
+    values go in ``extra`` rather than onto the shared instance.
+    """
+    return StructuredLogger(name)
 
 
 def with_logging(func):
@@ -160,26 +370,31 @@ def with_logging(func):
         def my_function(arg1, arg2):
             pass
     """
+    logger = _get_logger(func.__module__)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        logger = StructuredLogger(func.__module__)
-        start_time = datetime.utcnow()
+        # Ties the start/completion records of this call together
+        call_id = str(uuid.uuid4())
+        start_ns = time.perf_counter_ns()
 
         logger.info(
             f"Starting {func.__name__}",
             extra={
+                "correlation_id": call_id,
                 "function": func.__name__,
-                "module": func.__module__
+                "func_module": func.__module__
             }
         )
 
         try:
             result = func(*args, **kwargs)
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
             logger.info(
                 f"Completed {func.__name__}",
                 extra={
+                    "correlation_id": call_id,
                     "function": func.__name__,
                     "duration_ms": round(duration_ms, 2),
                     "status": "success"
@@ -189,11 +404,12 @@ def with_logging(func):
             return result
 
         except Exception as e:
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
             logger.error(
                 f"Failed {func.__name__}",
                 extra={
+                    "correlation_id": call_id,
                     "function": func.__name__,
                     "duration_ms": round(duration_ms, 2),
                     "status": "error",
@@ -216,8 +432,12 @@ def log_lambda_event(logger: StructuredLogger, event: dict, context: Any):
         event: Lambda event dict
         context: Lambda context object
     """
+    # The request ID is the natural correlation ID for an invocation, and
+    # setting it up front means no UUID is generated for the logger
+    logger.set_correlation_id(context.aws_request_id)
+
     logger.add_context(
-        lambda_request_id=context.request_id,
+        lambda_request_id=context.aws_request_id,
         lambda_function_name=context.function_name,
         lambda_function_version=context.function_version,
         lambda_memory_limit_mb=context.memory_limit_in_mb
@@ -231,6 +451,10 @@ def log_lambda_event(logger: StructuredLogger, event: dict, context: Any):
         }
     )
 
+    # Full event payloads can be large; the record (and its serialization)
+    # is skipped unless DEBUG is enabled or buffered
+    logger.debug("Received event", extra={"event": event})
+
 
 def log_step_function_input(logger: StructuredLogger, input_data: dict):
     """
@@ -5,15 +5,18 @@ This module provides a clean interface for publishing metrics without
 cluttering business logic code.
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict
-from functools import wraps
+import re
+import time
+from typing import NamedTuple, Optional, Sequence
+from functools import lru_cache, wraps
 
-from aws_clients import put_cloudwatch_metric
+from aws_clients import flush_metrics, put_cloudwatch_metric
 from constants import (
     MetricNamespace,
     MetricName,
+    ENABLE_BUSINESS_METRICS,
     ENABLE_COST_TRACKING,
+    ENABLE_PIPELINE_METRICS,
     ENVIRONMENT
 )
 from logging_config import StructuredLogger
@@ -21,21 +24,95 @@ from logging_config import StructuredLogger
 logger = StructuredLogger(__name__)
 
 
+class Dimension(NamedTuple):
+    """
+    A CloudWatch metric dimension.
+
+    Lighter than the {"Name": ..., "Value": ...} dict the API expects;
+    put_cloudwatch_metric converts it when the datum is built at flush time.
+    """
+
+    Name: str
+    Value: str
+
+
+# Every distinct dimension combination is billed as its own custom metric,
+# so dimensions must stay low-cardinality (no ticket, customer or request IDs)
+MAX_METRIC_DIMENSIONS = 3
+_ID_LIKE_VALUE = re.compile(
+    r'^(\d{5,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def _check_dimensions(name: str, dimensions: tuple) -> None:
+    """
+    Warn when a metric's dimensions look high-cardinality.
+
+    Cached per (metric, dimensions) combination, so the regex runs once
+    for each distinct combination rather than on every publish, and a
+    regression is logged once instead of per datum.
+    """
+    if len(dimensions) > MAX_METRIC_DIMENSIONS or any(
+        _ID_LIKE_VALUE.match(str(dimension.Value)) for dimension in dimensions
+    ):
+        logger.warning(
+            "High-cardinality metric dimensions: %s",
+            name,
+            extra={
+                "metric_name": name,
+                "dimensions": {dimension.Name: dimension.Value for dimension in dimensions}
+            }
+        )
+
+
+# Environment is fixed per process; every datum shares this one dimension
+_ENVIRONMENT_DIMENSION = Dimension("Environment", ENVIRONMENT)
+
+
+def _requires(enabled: bool):
+    """
+    Gate a record_* method on a namespace feature flag.
+
+    Flags are fixed for the life of the process, so the decision is made
+    once at class creation: enabled methods are returned untouched (no
+    wrapper on the hot path) and disabled ones become a no-op that skips
+    dimension building and buffering entirely.
+
+    Args:
+        enabled: Feature flag value for the metric namespace
+    """
+    def decorator(func):
+        if enabled:
+            return func
+
+        @wraps(func)
+        def disabled(self, *args, **kwargs):
+            return None
+
+        return disabled
+    return decorator
+
+
 class MetricsCollector:
     """
     Collects and publishes CloudWatch metrics with automatic dimensioning.
 
+    Recorded metrics are buffered and sent in PutMetricData batches of up
+    to 1000 (see put_cloudwatch_metric); call flush() before a Lambda
+    handler returns so nothing is left behind when the container freezes.
+
     Usage:
         metrics = MetricsCollector()
         metrics.record_ticket_ingested(ticket_id="12345")
         metrics.record_latency("RAGPipeline", duration_ms=1234)
+        metrics.flush()
     """
 
     def __init__(self):
         """Initialize metrics collector."""
-        self.default_dimensions = [
-            {"Name": "Environment", "Value": ENVIRONMENT}
-        ]
+        self.default_dimensions: tuple = (_ENVIRONMENT_DIMENSION,)
 
     def _publish_metric(
         self,
@@ -43,7 +120,7 @@ class MetricsCollector:
         value: float,
         namespace: str,
         unit: str = "None",
-        dimensions: Optional[List[Dict]] = None
+        dimensions: Optional[Sequence[Dimension]] = None
     ):
         """
         Internal method to publish metric with default dimensions.
@@ -53,11 +130,15 @@ class MetricsCollector:
             value: Metric value
             namespace: CloudWatch namespace
             unit: Metric unit
-            dimensions: Additional dimensions (merged with defaults)
+            dimensions: Additional dimensions (merged with defaults); keep
+                these low-cardinality (no ticket or customer IDs)
         """
-        all_dimensions = self.default_dimensions.copy()
-        if dimensions:
-            all_dimensions.extend(dimensions)
+        all_dimensions = (
+            (*self.default_dimensions, *dimensions) if dimensions
+            else self.default_dimensions
+        )
+
+        _check_dimensions(name, all_dimensions)
 
         put_cloudwatch_metric(
             metric_name=name,
@@ -67,23 +148,30 @@ class MetricsCollector:
             unit=unit
         )
 
+    def flush(self) -> int:
+        """
+        Publish all buffered metrics now.
+
+        Returns:
+            Number of metric datums published
+        """
+        return flush_metrics()
+
     # ========================================================================
     # Pipeline Metrics
     # ========================================================================
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_ticket_ingested(self, ticket_id: str, customer_id: str):
         """Record ticket ingestion event."""
         self._publish_metric(
             name=MetricName.TICKET_INGESTED.value,
             value=1,
             namespace=MetricNamespace.PIPELINE.value,
-            unit="Count",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "CustomerID", "Value": customer_id}
-            ]
+            unit="Count"
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_embedding_generated(self, ticket_id: str, dimension: int):
         """Record embedding generation event."""
         self._publish_metric(
@@ -91,12 +179,10 @@ class MetricsCollector:
             value=1,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Count",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "EmbeddingDimension", "Value": str(dimension)}
-            ]
+            dimensions=(Dimension("EmbeddingDimension", str(dimension)),)
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_rag_pipeline_success(self, ticket_id: str, num_smes_found: int):
         """Record successful RAG pipeline execution."""
         self._publish_metric(
@@ -104,12 +190,10 @@ class MetricsCollector:
             value=1,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Count",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "SMEsFound", "Value": str(num_smes_found)}
-            ]
+            dimensions=(Dimension("SMEsFound", str(num_smes_found)),)
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_rag_pipeline_failure(self, ticket_id: str, error_type: str):
         """Record RAG pipeline failure."""
         self._publish_metric(
@@ -117,12 +201,10 @@ class MetricsCollector:
             value=1,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Count",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "ErrorType", "Value": error_type}
-            ]
+            dimensions=(Dimension("ErrorType", error_type),)
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_slack_notification_sent(self, ticket_id: str, cre_id: str):
         """Record Slack notification sent."""
         self._publish_metric(
@@ -130,12 +212,10 @@ class MetricsCollector:
             value=1,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Count",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "CREID", "Value": cre_id}
-            ]
+            dimensions=(Dimension("CREID", cre_id),)
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_latency(
         self,
         component: str,
@@ -148,20 +228,18 @@ class MetricsCollector:
         Args:
             component: Component name (e.g., "TicketIngestion", "RAGPipeline")
             duration_ms: Duration in milliseconds
-            ticket_id: Optional ticket ID for correlation
+            ticket_id: Optional ticket ID; not published, since per-ticket
+                dimensions create a custom metric per ticket
         """
-        dimensions = [{"Name": "Component", "Value": component}]
-        if ticket_id:
-            dimensions.append({"Name": "TicketID", "Value": ticket_id})
-
         self._publish_metric(
             name=MetricName.END_TO_END_LATENCY.value,
             value=duration_ms,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Milliseconds",
-            dimensions=dimensions
+            dimensions=(Dimension("Component", component),)
         )
 
+    @_requires(ENABLE_PIPELINE_METRICS)
     def record_error_rate(self, component: str, error_rate_percent: float):
         """Record component error rate."""
         self._publish_metric(
@@ -169,13 +247,14 @@ class MetricsCollector:
             value=error_rate_percent,
             namespace=MetricNamespace.PIPELINE.value,
             unit="Percent",
-            dimensions=[{"Name": "Component", "Value": component}]
+            dimensions=(Dimension("Component", component),)
         )
 
     # ========================================================================
     # Business Metrics
     # ========================================================================
 
+    @_requires(ENABLE_BUSINESS_METRICS)
     def record_sme_match_accuracy(
         self,
         ticket_id: str,
@@ -197,13 +276,13 @@ class MetricsCollector:
             value=accuracy,
             namespace=MetricNamespace.BUSINESS.value,
             unit="None",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "SelectedRank", "Value": str(selected_rank)},
-                {"Name": "WasHelpful", "Value": str(was_helpful)}
-            ]
+            dimensions=(
+                Dimension("SelectedRank", str(selected_rank)),
+                Dimension("WasHelpful", str(was_helpful))
+            )
         )
 
+    @_requires(ENABLE_BUSINESS_METRICS)
     def record_average_confidence(
         self,
         ticket_id: str,
@@ -214,10 +293,10 @@ class MetricsCollector:
             name=MetricName.AVERAGE_CONFIDENCE.value,
             value=confidence_score,
             namespace=MetricNamespace.BUSINESS.value,
-            unit="None",
-            dimensions=[{"Name": "TicketID", "Value": ticket_id}]
+            unit="None"
         )
 
+    @_requires(ENABLE_BUSINESS_METRICS)
     def record_handoff_success(self, ticket_id: str, was_successful: bool):
         """Record whether handoff was successful."""
         success_value = 1.0 if was_successful else 0.0
@@ -227,12 +306,10 @@ class MetricsCollector:
             value=success_value,
             namespace=MetricNamespace.BUSINESS.value,
             unit="None",
-            dimensions=[
-                {"Name": "TicketID", "Value": ticket_id},
-                {"Name": "Successful", "Value": str(was_successful)}
-            ]
+            dimensions=(Dimension("Successful", str(was_successful)),)
         )
 
+    @_requires(ENABLE_BUSINESS_METRICS)
     def record_time_to_resolution(
         self,
         ticket_id: str,
@@ -243,10 +320,10 @@ class MetricsCollector:
             name=MetricName.TIME_TO_RESOLUTION.value,
             value=resolution_hours,
             namespace=MetricNamespace.BUSINESS.value,
-            unit="None",
-            dimensions=[{"Name": "TicketID", "Value": ticket_id}]
+            unit="None"
         )
 
+    @_requires(ENABLE_BUSINESS_METRICS)
     def record_cre_satisfaction(
         self,
         ticket_id: str,
@@ -257,14 +334,14 @@ class MetricsCollector:
             name=MetricName.CRE_SATISFACTION.value,
             value=float(satisfaction_score),
             namespace=MetricNamespace.BUSINESS.value,
-            unit="None",
-            dimensions=[{"Name": "TicketID", "Value": ticket_id}]
+            unit="None"
         )
 
     # ========================================================================
     # Cost Metrics
     # ========================================================================
 
+    @_requires(ENABLE_COST_TRACKING)
     def record_bedrock_tokens(
         self,
         model_id: str,
@@ -281,35 +358,35 @@ class MetricsCollector:
             output_tokens: Number of output tokens
             cost_usd: Estimated cost in USD
         """
-        if not ENABLE_COST_TRACKING:
-            return
-
-        total_tokens = input_tokens + output_tokens
-
-        self._publish_metric(
-            name=MetricName.BEDROCK_TOKENS_CONSUMED.value,
-            value=total_tokens,
-            namespace=MetricNamespace.COST.value,
-            unit="Count",
-            dimensions=[
-                {"Name": "ModelID", "Value": model_id},
-                {"Name": "TokenType", "Value": "Total"}
-            ]
-        )
+        # TokenType=Total is what existing dashboards and alarms read; Input
+        # and Output are published alongside it under the same dimension
+        for token_type, tokens in (
+            ("Total", input_tokens + output_tokens),
+            ("Input", input_tokens),
+            ("Output", output_tokens)
+        ):
+            self._publish_metric(
+                name=MetricName.BEDROCK_TOKENS_CONSUMED.value,
+                value=tokens,
+                namespace=MetricNamespace.COST.value,
+                unit="Count",
+                dimensions=(
+                    Dimension("ModelID", model_id),
+                    Dimension("TokenType", token_type)
+                )
+            )
 
         self._publish_metric(
             name=MetricName.BEDROCK_COST_USD.value,
             value=cost_usd,
             namespace=MetricNamespace.COST.value,
             unit="None",
-            dimensions=[{"Name": "ModelID", "Value": model_id}]
+            dimensions=(Dimension("ModelID", model_id),)
         )
 
+    @_requires(ENABLE_COST_TRACKING)
     def record_pinecone_queries(self, num_queries: int, cost_estimate_usd: float):
         """Record Pinecone query count and estimated cost."""
-        if not ENABLE_COST_TRACKING:
-            return
-
         self._publish_metric(
             name=MetricName.PINECONE_QUERIES.value,
             value=num_queries,
@@ -317,33 +394,31 @@ class MetricsCollector:
             unit="Count"
         )
 
+    @_requires(ENABLE_COST_TRACKING)
     def record_lambda_invocation(self, function_name: str, duration_ms: float):
-        """Record Lambda invocation for cost tracking."""
-        if not ENABLE_COST_TRACKING:
-            return
+        """
+        Record Lambda invocation for cost tracking.
 
+        duration_ms is no longer a dimension (each distinct value created a
+        new metric); Lambda's own Duration metric covers it.
+        """
         self._publish_metric(
             name=MetricName.LAMBDA_INVOCATIONS.value,
             value=1,
             namespace=MetricNamespace.COST.value,
             unit="Count",
-            dimensions=[
-                {"Name": "FunctionName", "Value": function_name},
-                {"Name": "DurationMS", "Value": str(int(duration_ms))}
-            ]
+            dimensions=(Dimension("FunctionName", function_name),)
         )
 
+    @_requires(ENABLE_COST_TRACKING)
     def record_ecs_runtime(self, task_name: str, runtime_hours: float):
         """Record ECS task runtime for cost tracking."""
-        if not ENABLE_COST_TRACKING:
-            return
-
         self._publish_metric(
             name=MetricName.ECS_RUNTIME_HOURS.value,
             value=runtime_hours,
             namespace=MetricNamespace.COST.value,
             unit="None",
-            dimensions=[{"Name": "TaskName", "Value": task_name}]
+            dimensions=(Dimension("TaskName", task_name),)
         )
 
 
@@ -355,6 +430,10 @@ def track_latency(component_name: str):
     """
     Decorator to automatically track function execution latency.
 
+    Buffered metrics (the handler's and the latency datum) are flushed once
+    here, on both the success and failure paths; decorated handlers should
+    not flush themselves.
+
     Usage:
         @track_latency("TicketIngestion")
         def ingest_ticket(ticket_id):
@@ -363,14 +442,15 @@ def track_latency(component_name: str):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            metrics = MetricsCollector()
-            start_time = datetime.utcnow()
+            # Module-level singleton (defined below); resolved at call time
+            metrics = metrics_collector
+            start_ns = time.perf_counter_ns()
 
             try:
                 result = func(*args, **kwargs)
 
                 # Calculate latency
-                duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
                 # Extract ticket_id if available in args or kwargs
                 ticket_id = kwargs.get('ticket_id') or (args[0] if args else None)
@@ -385,13 +465,26 @@ def track_latency(component_name: str):
 
             except Exception as e:
                 # Still record latency even on failure
-                duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 metrics.record_latency(
                     component=component_name,
                     duration_ms=duration_ms
                 )
                 raise
 
+            finally:
+                # Single flush point for everything the handler queued plus
+                # the latency datum; it must never replace the handler's
+                # own return value or exception
+                try:
+                    metrics.flush()
+                except Exception as e:
+                    logger.warning(
+                        "Failed to flush metrics for %s",
+                        component_name,
+                        extra={"error": str(e)}
+                    )
+
         return wrapper
     return decorator
 
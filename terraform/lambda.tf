@@ -25,6 +25,9 @@ resource "null_resource" "lambda_dependencies" {
   triggers = {
     requirements_zendesk = filemd5("${path.module}/../lambdas/action-groups/zendesk/requirements.txt")
     requirements_slack   = filemd5("${path.module}/../lambdas/action-groups/slack/requirements.txt")
+    shared_code          = sha1(join("", [
+      for f in fileset("${path.module}/../shared/python", "*.py") : filemd5("${path.module}/../shared/python/${f}")
+    ]))
   }
 
   provisioner "local-exec" {
@@ -32,6 +35,8 @@ resource "null_resource" "lambda_dependencies" {
       mkdir -p ${path.module}/builds/python
       pip install -r ${path.module}/../lambdas/action-groups/zendesk/requirements.txt -t ${path.module}/builds/python/
       pip install -r ${path.module}/../lambdas/action-groups/slack/requirements.txt -t ${path.module}/builds/python/
+      # Shared helpers (aws_clients, constants, logging_config, ...) imported flat by the handlers
+      find ${path.module}/../shared/python -maxdepth 1 -name '*.py' ! -name '__init__.py' -exec cp {} ${path.module}/builds/python/ \;
     EOT
   }
 }
@@ -95,7 +100,8 @@ resource "aws_lambda_function" "slack_actions" {
 
   environment {
     variables = {
-      SLACK_SECRET_NAME = aws_secretsmanager_secret.slack_credentials.name
+      SLACK_SECRET_NAME   = aws_secretsmanager_secret.slack_credentials.name
+      SLACK_WORKSPACE_URL = var.slack_team_url
     }
   }
 